@@ -4,6 +4,7 @@ from . import button
 from . import cmd
 from . import typing
 
+from .batchpidsubsystem import BatchPIDSubsystem
 from .commandscheduler import CommandScheduler
 from .conditionalcommand import ConditionalCommand
 from .deferredcommand import DeferredCommand
@@ -23,6 +24,7 @@ from .proxycommand import ProxyCommand
 from .repeatcommand import RepeatCommand
 from .runcommand import RunCommand
 from .schedulecommand import ScheduleCommand
+from .schedulertrace import SchedulerTrace, TraceEvent
 from .selectcommand import SelectCommand
 from .sequentialcommandgroup import SequentialCommandGroup
 from .startendcommand import StartEndCommand
@@ -40,6 +42,7 @@ from typing import TYPE_CHECKING
 __all__ = [
     "button",
     "cmd",
+    "BatchPIDSubsystem",
     "Command",
     "CommandScheduler",
     "ConditionalCommand",
@@ -61,12 +64,14 @@ __all__ = [
     "RepeatCommand",
     "RunCommand",
     "ScheduleCommand",
+    "SchedulerTrace",
     "SelectCommand",
     "SequentialCommandGroup",
     "StartEndCommand",
     "Subsystem",
     "SwerveControllerCommand",
     "TimedCommandRobot",
+    "TraceEvent",
     "TrapezoidProfileCommand",
     "TrapezoidProfileSubsystem",
     "WaitCommand",
@@ -0,0 +1,258 @@
+# notrack
+from __future__ import annotations
+
+import math
+from typing import List, Sequence
+
+from .subsystem import Subsystem
+
+
+class BatchPIDSubsystem(Subsystem):
+    """
+    A subsystem that runs a bank of PID loops, one per mechanism, from a single
+    :meth:`.periodic` call. Useful for mechanisms that are made of several similar loops, such as
+    the modules of a swerve drive or the wheels of a shooter.
+
+    The gains, setpoints and integrator state of every loop are kept in flat lists and the enabled
+    loops are stepped together in plain Python, which is cheaper than one
+    :class:`wpimath.controller.PIDController` call per loop. Each loop follows the same control
+    law as a PIDController that is reset when the loop is enabled, as :class:`.PIDSubsystem` does
+    (including the integrator range and IZone), but continuous input is not supported.
+
+    Users provide all of the measurements at once by overriding :meth:`.getMeasurements`, and
+    consume the output of each enabled loop by overriding :meth:`.useOutput`.
+    """
+
+    def __init__(
+        self,
+        count: int,
+        kp: float = 0.0,
+        ki: float = 0.0,
+        kd: float = 0.0,
+        period: float = 0.02,
+    ):
+        """
+        Creates a new BatchPIDSubsystem. All loops start disabled with the given gains and a
+        setpoint of zero.
+
+        :param count: The number of PID loops.
+        :param kp:     The initial proportional coefficient of every loop.
+        :param ki:     The initial integral coefficient of every loop.
+        :param kd:     The initial derivative coefficient of every loop.
+        :param period: The period between updates, in seconds.
+        """
+        super().__init__()
+
+        assert count > 0
+        assert period > 0
+
+        self._count = count
+        self._period = period
+
+        self._kp: List[float] = [kp] * count
+        self._ki: List[float] = [ki] * count
+        self._kd: List[float] = [kd] * count
+        self._iZone: List[float] = [math.inf] * count
+        self._minIntegral: List[float] = [-1.0] * count
+        self._maxIntegral: List[float] = [1.0] * count
+        # The bounds of the accumulated error, the integrator range divided by ki
+        self._minTotalError: List[float] = [0.0] * count
+        self._maxTotalError: List[float] = [0.0] * count
+
+        self._setpoints: List[float] = [0.0] * count
+        self._errors: List[float] = [0.0] * count
+        self._totalErrors: List[float] = [0.0] * count
+        self._enabled: List[bool] = [False] * count
+        # The indices of the enabled loops, in order
+        self._active: List[int] = []
+
+        for index in range(count):
+            self._updateIntegralBounds(index)
+
+    def _updateIntegralBounds(self, index: int) -> None:
+        ki = self._ki[index]
+        if ki != 0:
+            self._minTotalError[index] = self._minIntegral[index] / ki
+            self._maxTotalError[index] = self._maxIntegral[index] / ki
+
+    def periodic(self):
+        """Updates every enabled loop and passes its output to :meth:`.useOutput`."""
+        active = self._active
+        if not active:
+            return
+
+        measurements = self.getMeasurements()
+        if len(measurements) != self._count:
+            raise ValueError(
+                f"getMeasurements() returned {len(measurements)} measurements, expected {self._count}"
+            )
+
+        period = self._period
+        rate = 1 / period
+        setpoints = self._setpoints
+        errors = self._errors
+        totalErrors = self._totalErrors
+        kps = self._kp
+        kis = self._ki
+        kds = self._kd
+        iZones = self._iZone
+        minTotalErrors = self._minTotalError
+        maxTotalErrors = self._maxTotalError
+        outputs = []
+
+        for i in active:
+            setpoint = setpoints[i]
+            error = setpoint - measurements[i]
+            output = kps[i] * error + kds[i] * (error - errors[i]) * rate
+            errors[i] = error
+
+            if abs(error) > iZones[i]:
+                totalErrors[i] = 0.0
+            else:
+                ki = kis[i]
+                if ki != 0:
+                    totalError = totalErrors[i] + error * period
+                    if totalError < minTotalErrors[i]:
+                        totalError = minTotalErrors[i]
+                    elif totalError > maxTotalErrors[i]:
+                        totalError = maxTotalErrors[i]
+                    totalErrors[i] = totalError
+                    output += ki * totalError
+
+            outputs.append((i, output, setpoint))
+
+        useOutput = self.useOutput
+        for i, output, setpoint in outputs:
+            useOutput(i, output, setpoint)
+
+    def getCount(self) -> int:
+        """
+        Returns the number of loops in the subsystem.
+
+        :return: The number of loops.
+        """
+        return self._count
+
+    def setPID(self, index: int, kp: float, ki: float, kd: float):
+        """
+        Sets the gains of a loop.
+
+        :param index: The index of the loop.
+        :param kp:    The proportional coefficient.
+        :param ki:    The integral coefficient.
+        :param kd:    The derivative coefficient.
+        """
+        self._kp[index] = kp
+        self._ki[index] = ki
+        self._kd[index] = kd
+        self._updateIntegralBounds(index)
+
+    def setIZone(self, index: int, iZone: float):
+        """
+        Sets the IZone of a loop. When the absolute value of the error is greater than the IZone,
+        the total accumulated error of that loop is reset to zero.
+
+        :param index: The index of the loop.
+        :param iZone: The maximum magnitude of error to allow integral control.
+        """
+        assert iZone >= 0
+        self._iZone[index] = iZone
+
+    def setIntegratorRange(
+        self, index: int, minimumIntegral: float, maximumIntegral: float
+    ):
+        """
+        Sets the minimum and maximum contributions of the integral term of a loop.
+
+        :param index:           The index of the loop.
+        :param minimumIntegral: The minimum contribution of the integral term.
+        :param maximumIntegral: The maximum contribution of the integral term.
+        """
+        self._minIntegral[index] = minimumIntegral
+        self._maxIntegral[index] = maximumIntegral
+        self._updateIntegralBounds(index)
+
+    def setSetpoint(self, index: int, setpoint: float):
+        """
+        Sets the setpoint of a loop.
+
+        :param index:    The index of the loop.
+        :param setpoint: The setpoint for the loop.
+        """
+        self._setpoints[index] = setpoint
+
+    def setSetpoints(self, setpoints: Sequence[float]):
+        """
+        Sets the setpoints of every loop.
+
+        :param setpoints: The setpoints, one for each loop.
+        """
+        assert len(setpoints) == self._count
+        self._setpoints[:] = setpoints
+
+    def getSetpoint(self, index: int) -> float:
+        """
+        Returns the setpoint of a loop.
+
+        :param index: The index of the loop.
+        :return: The current setpoint.
+        """
+        return self._setpoints[index]
+
+    def reset(self, index: int):
+        """
+        Resets the previous error and the integral term of a loop.
+
+        :param index: The index of the loop.
+        """
+        self._errors[index] = 0.0
+        self._totalErrors[index] = 0.0
+
+    def useOutput(self, index: int, output: float, setpoint: float):
+        """
+        Uses the output of a loop.
+
+        :param index:    The index of the loop.
+        :param output:   The output of the loop.
+        :param setpoint: The setpoint of the loop (for feedforward).
+        """
+        raise NotImplementedError(f"{self.__class__} must implement useOutput")
+
+    def getMeasurements(self) -> Sequence[float]:
+        """
+        Returns the measurements of the process variables of all of the loops.
+
+        :return: The measurements, one for each loop.
+        """
+        raise NotImplementedError(f"{self.__class__} must implement getMeasurements")
+
+    def enable(self, index: int):
+        """Enables a loop. Resets its controller state."""
+        self._enabled[index] = True
+        self._active = [i for i, enabled in enumerate(self._enabled) if enabled]
+        self.reset(index)
+
+    def disable(self, index: int):
+        """Disables a loop. Sets its output to zero."""
+        self._enabled[index] = False
+        self._active = [i for i, enabled in enumerate(self._enabled) if enabled]
+        self.useOutput(index, 0, 0)
+
+    def enableAll(self):
+        """Enables every loop. Resets their controller state."""
+        for index in range(self._count):
+            self.enable(index)
+
+    def disableAll(self):
+        """Disables every loop. Sets their outputs to zero."""
+        for index in range(self._count):
+            self.disable(index)
+
+    def isEnabled(self, index: int) -> bool:
+        """
+        Returns whether a loop is enabled.
+
+        :param index: The index of the loop.
+        :return: Whether the loop is enabled.
+        """
+        return self._enabled[index]
@@ -2,10 +2,13 @@ from .commandgenerichid import CommandGenericHID
 from .commandjoystick import CommandJoystick
 from .commandps4controller import CommandPS4Controller
 from .commandxboxcontroller import CommandXboxController
+from .debouncebank import DebounceBank
 from .joystickbutton import JoystickButton
-from .networkbutton import NetworkButton
+from .networkbutton import EventNetworkButton, NetworkButton
+from .networkbuttonbank import NetworkButtonBank
 from .povbutton import POVButton
 from .trigger import Trigger
+from .triggerrecorder import TriggerRecorder, TriggerReplayer
 
 __all__ = [
     "Trigger",
@@ -13,7 +16,12 @@ __all__ = [
     "CommandJoystick",
     "CommandPS4Controller",
     "CommandXboxController",
+    "DebounceBank",
     "JoystickButton",
     "NetworkButton",
+    "EventNetworkButton",
+    "NetworkButtonBank",
     "POVButton",
+    "TriggerRecorder",
+    "TriggerReplayer",
 ]
@@ -0,0 +1,101 @@
+# notrack
+from array import array
+from typing import Callable, List, Optional
+
+from wpilib import Timer
+from wpilib.event import EventLoop
+from wpimath.filter import Debouncer
+
+from ..commandscheduler import CommandScheduler
+from .trigger import Trigger
+
+
+class DebounceBank:
+    """
+    Debounces many conditions together. Equivalent to calling :meth:`Trigger.debounce` on each
+    condition, but the FPGA timestamp is read once per poll of the bank's loop and the state of
+    every debounced condition is updated in a single pass, instead of each
+    :class:`wpimath.filter.Debouncer` reading the clock on its own.
+
+    The debounced triggers follow the same rules as :class:`wpimath.filter.Debouncer`, and only
+    change when the bank's loop is polled.
+    """
+
+    def __init__(self, loop: Optional[EventLoop] = None):
+        """
+        Creates a new, empty DebounceBank.
+
+        :param loop: The loop that polls the bank and its triggers. Defaults to the default
+                     scheduler button loop.
+        """
+        if loop is None:
+            loop = CommandScheduler.getInstance().getDefaultButtonLoop()
+        self._loop = loop
+
+        self._conditions: List[Callable[[], bool]] = []
+        self._periods = array("d")
+        self._bothTypes: List[bool] = []
+        self._baselines: List[bool] = []
+        self._outputs: List[bool] = []
+        self._prevTimes = array("d")
+
+        # Bound before any debounced trigger, so they all see this poll's outputs
+        loop.bind(self._update)
+
+    def _update(self) -> None:
+        now = Timer.getFPGATimestamp()
+        prevTimes = self._prevTimes
+        baselines = self._baselines
+        outputs = self._outputs
+
+        for i, (condition, period, both) in enumerate(
+            zip(self._conditions, self._periods, self._bothTypes)
+        ):
+            value = bool(condition())
+            baseline = baselines[i]
+            if value == baseline:
+                prevTimes[i] = now
+                outputs[i] = baseline
+            elif now - prevTimes[i] >= period:
+                if both:
+                    baselines[i] = value
+                    prevTimes[i] = now
+                outputs[i] = value
+            else:
+                outputs[i] = baseline
+
+    def debounce(
+        self,
+        condition: Callable[[], bool],
+        seconds: float,
+        debounce_type: Debouncer.DebounceType = Debouncer.DebounceType.kRising,
+    ) -> Trigger:
+        """
+        Adds a condition to the bank.
+
+        :param condition:     The condition to debounce, such as a :class:`Trigger`.
+        :param seconds:       The debounce period.
+        :param debounce_type: The debounce type.
+        :returns: The debounced trigger.
+        """
+        assert callable(condition)
+        index = len(self._conditions)
+        baseline = debounce_type == Debouncer.DebounceType.kFalling
+
+        self._conditions.append(condition)
+        self._periods.append(seconds)
+        self._bothTypes.append(debounce_type == Debouncer.DebounceType.kBoth)
+        self._baselines.append(baseline)
+        self._outputs.append(baseline)
+        self._prevTimes.append(Timer.getFPGATimestamp())
+
+        outputs = self._outputs
+        return Trigger(self._loop, lambda: outputs[index])
+
+    def size(self) -> int:
+        """
+        Returns the number of conditions in the bank.
+
+        :returns: the number of debounced conditions
+        """
+        return len(self._conditions)
@@ -1,7 +1,17 @@
 # validated: 2024-01-20 DS 7a099cb02a33 button/NetworkButton.java
-from typing import overload
-
-from ntcore import BooleanSubscriber, BooleanTopic, NetworkTable, NetworkTableInstance
+from collections import deque
+from typing import Deque, List, overload
+
+from ntcore import (
+    BooleanSubscriber,
+    BooleanTopic,
+    Event,
+    EventFlags,
+    NetworkTable,
+    NetworkTableInstance,
+    PubSubOptions,
+    ValueEventData,
+)
 
 from ..util import format_args_kwargs
 from .trigger import Trigger
@@ -63,12 +73,10 @@ class NetworkButton(Trigger):
 
     def __init__(self, *args, **kwargs) -> None:
         def init_sub(sub: BooleanSubscriber):
-            return super(NetworkButton, self).__init__(
-                lambda: sub.getTopic().getInstance().isConnected() and sub.get()
-            )
+            return self._initSubscriber(sub)
 
         def init_topic(topic: BooleanTopic):
-            init_sub(topic.subscribe(False))
+            init_sub(self._subscribe(topic))
 
         def init_table_field(table: NetworkTable, field: str):
             init_topic(table.getBooleanTopic(field))
@@ -124,3 +132,73 @@ TypeError: NetworkButton(): incompatible function arguments. The following argum
 Invoked with: {format_args_kwargs(self, *args, **kwargs)}
 """
         )
+
+    def _subscribe(self, topic: BooleanTopic) -> BooleanSubscriber:
+        return topic.subscribe(False)
+
+    def _initSubscriber(self, sub: BooleanSubscriber) -> None:
+        super().__init__(
+            lambda: sub.getTopic().getInstance().isConnected() and sub.get()
+        )
+
+
+class EventNetworkButton(NetworkButton):
+    """
+    A :class:`NetworkButton` that is updated by NetworkTables listeners instead of reading its
+    subscriber every time it is polled. Accepts the same arguments as :class:`NetworkButton`.
+
+    Every change of the value is queued by the listener, and each poll of the trigger's loop
+    advances through at most one queued value. A short pulse published between two polls is
+    therefore seen as a press on one poll and a release on the next, instead of being missed.
+    Polls where nothing changed only check that the queue is empty.
+
+    When constructed from a topic, the subscriber is created with ``sendAll`` so that remote
+    changes are not coalesced. Subscribers passed in directly are used as they are.
+
+    Listener callbacks run on the NetworkTables listener thread, so a change becomes visible to
+    the trigger on the first poll after the callback has run.
+    """
+
+    def _subscribe(self, topic: BooleanTopic) -> BooleanSubscriber:
+        return topic.subscribe(False, PubSubOptions(sendAll=True))
+
+    def _initSubscriber(self, sub: BooleanSubscriber) -> None:
+        self._sub = sub
+        self._inst = sub.getTopic().getInstance()
+        self._pending: Deque[bool] = deque()
+
+        self._connected = self._inst.isConnected()
+        self._value = sub.get()
+        # Only touched by the listener thread once the listeners are added
+        self._lastQueued = self._value
+
+        self._listeners: List[int] = [
+            self._inst.addListener(sub, EventFlags.kValueAll, self._onValue),
+            self._inst.addConnectionListener(False, self._onConnection),
+        ]
+
+        Trigger.__init__(self, lambda: self._connected and self._value)
+        # Bound before any binding of this trigger, so the value is advanced first
+        self._loop.bind(self._advance)
+
+    def _onValue(self, event: Event) -> None:
+        data = event.data
+        if not isinstance(data, ValueEventData):
+            return
+        value = data.value.getBoolean()
+        if value != self._lastQueued:
+            self._lastQueued = value
+            self._pending.append(value)
+
+    def _onConnection(self, event: Event) -> None:
+        self._connected = self._inst.isConnected()
+
+    def _advance(self) -> None:
+        if self._pending:
+            self._value = self._pending.popleft()
+
+    def close(self) -> None:
+        """Removes the NetworkTables listeners of this button. It keeps its last value."""
+        for listener in self._listeners:
+            self._inst.removeListener(listener)
+        self._listeners.clear()
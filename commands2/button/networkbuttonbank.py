@@ -0,0 +1,114 @@
+# notrack
+from typing import Dict, List, Optional, Union
+
+from ntcore import (
+    BooleanArraySubscriber,
+    BooleanArrayTopic,
+    IntegerSubscriber,
+    IntegerTopic,
+)
+from wpilib.event import EventLoop
+
+from ..commandscheduler import CommandScheduler
+from .trigger import Trigger
+
+_kMask = (1 << 64) - 1
+
+
+class NetworkButtonBank:
+    """
+    A bank of buttons backed by a single :class:`ntcore.NetworkTable` topic, either a boolean
+    array (one element per button) or an integer bitmask (one bit per button, starting with the
+    least significant bit).
+
+    The topic is read once per poll of the bank's loop and every button of the bank is derived
+    from that one value, instead of each button reading its own topic like a
+    :class:`NetworkButton` does. This suits operator consoles and dashboards that publish many
+    buttons at once.
+
+    Buttons that are missing from the published value (past the end of the array, or past the
+    highest set bit) are released. All buttons are released while the NetworkTables instance is
+    not connected.
+    """
+
+    def __init__(
+        self,
+        topic: Union[
+            BooleanArrayTopic, BooleanArraySubscriber, IntegerTopic, IntegerSubscriber
+        ],
+        loop: Optional[EventLoop] = None,
+    ):
+        """
+        Creates a new NetworkButtonBank.
+
+        :param topic: The boolean array or integer topic, or a subscriber to one.
+        :param loop:  The loop that polls the bank and its buttons. Defaults to the default
+                      scheduler button loop.
+        """
+        if isinstance(topic, BooleanArrayTopic):
+            topic = topic.subscribe([])
+        elif isinstance(topic, IntegerTopic):
+            topic = topic.subscribe(0)
+        elif not isinstance(topic, (BooleanArraySubscriber, IntegerSubscriber)):
+            raise TypeError(
+                f"NetworkButtonBank(): expected a boolean array or integer topic or subscriber, got {topic!r}"
+            )
+
+        if loop is None:
+            loop = CommandScheduler.getInstance().getDefaultButtonLoop()
+
+        self._sub = topic
+        self._inst = topic.getTopic().getInstance()
+        self._loop = loop
+        self._raw: Optional[Union[List[int], int]] = None
+        self._bits = 0
+        self._buttons: Dict[int, Trigger] = {}
+
+        self._update()
+        # Bound before any button of the bank, so they all see this poll's value
+        loop.bind(self._update)
+
+    def _update(self) -> None:
+        if not self._inst.isConnected():
+            self._raw = None
+            self._bits = 0
+            return
+
+        raw = self._sub.get()
+        if raw == self._raw:
+            return
+        self._raw = raw
+
+        if isinstance(raw, int):
+            # The topic is a signed 64-bit integer, use its two's complement bits
+            self._bits = raw & _kMask
+        else:
+            bits = 0
+            for i, pressed in enumerate(raw):
+                if pressed:
+                    bits |= 1 << i
+            self._bits = bits
+
+    def button(self, index: int) -> Trigger:
+        """
+        Returns a trigger for a button of the bank. The same trigger is returned for repeated
+        calls with the same index.
+
+        :param index: The index of the button, starting at zero.
+        :returns: a trigger that is active while the button is pressed
+        """
+        assert index >= 0
+        button = self._buttons.get(index)
+        if button is None:
+            mask = 1 << index
+            button = Trigger(self._loop, lambda: self._bits & mask != 0)
+            self._buttons[index] = button
+        return button
+
+    def getBits(self) -> int:
+        """
+        Returns the state of every button as a bitmask, as of the last poll.
+
+        :returns: the pressed buttons, one bit per button
+        """
+        return self._bits
@@ -1,8 +1,9 @@
 # validated: 2024-04-02 DS 0b1345946950 button/Trigger.java
 from types import SimpleNamespace
-from typing import Callable, overload
+from typing import Callable, Optional, overload
 
 from typing_extensions import Self
+from wpilib import Timer
 from wpilib.event import EventLoop
 from wpimath.filter import Debouncer
 
@@ -302,3 +303,51 @@ Invoked with: {format_args_kwargs(self, *args, **kwargs)}
         """
         debouncer = Debouncer(seconds, debounce_type)
         return Trigger(self._loop, lambda: debouncer.calculate(self()))
+
+    def sampled(
+        self, seconds: Optional[float] = None, ticks: Optional[int] = None
+    ) -> "Trigger":
+        """
+        Creates a new trigger that evaluates this trigger's condition at a lower rate, for
+        conditions that are expensive to evaluate. Exactly one of ``seconds`` or ``ticks`` must be
+        given.
+
+        The condition is evaluated once when the trigger is created, then by the loop when it is
+        polled and the period has passed. In between, the last value is returned, so every binding
+        and composed trigger sees the same value for the whole poll.
+
+        :param seconds: The minimum time between evaluations of the condition.
+        :param ticks:   The number of loop polls between evaluations of the condition.
+        :returns: The sampled trigger.
+        """
+        assert (seconds is None) != (ticks is None), "specify one of seconds or ticks"
+
+        state = SimpleNamespace(
+            value=bool(self._condition()),
+            lastTime=Timer.getFPGATimestamp(),
+            tick=0,
+        )
+
+        if ticks is not None:
+            assert ticks > 0
+
+            def update():
+                state.tick += 1
+                if state.tick >= ticks:
+                    state.tick = 0
+                    state.value = bool(self._condition())
+
+        else:
+            assert seconds is not None
+            period: float = seconds
+            assert period >= 0
+
+            def update():
+                now = Timer.getFPGATimestamp()
+                if now - state.lastTime >= period:
+                    state.lastTime = now
+                    state.value = bool(self._condition())
+
+        # Bound before any binding of the sampled trigger, so the value is refreshed first
+        self._loop.bind(update)
+        return Trigger(self._loop, lambda: state.value)
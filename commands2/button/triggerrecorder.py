@@ -0,0 +1,312 @@
+# notrack
+import struct
+from array import array
+from typing import Callable, List, Mapping, Optional, Tuple
+
+from wpilib import RobotController, RobotState
+from wpilib.event import EventLoop
+from wpilib.simulation import (
+    DriverStationSim,
+    isTimingPaused,
+    pauseTiming,
+    resumeTiming,
+    stepTiming,
+)
+
+from ..commandscheduler import CommandScheduler
+from .trigger import Trigger
+
+# magic, version, number of ticks, number of trigger columns
+_header = struct.Struct("<4sBIH")
+_magic = b"C2TR"
+_version = 1
+
+# The robot mode is stored as these boolean columns, ahead of the trigger columns
+_modes: Tuple[Callable[[], bool], ...] = (
+    RobotState.isEnabled,
+    RobotState.isAutonomous,
+    RobotState.isTest,
+    RobotState.isEStopped,
+)
+
+
+def _recordedValue(values: List[bool], index: int) -> Callable[[], bool]:
+    return lambda: values[index]
+
+
+def _packBits(values: bytearray) -> bytes:
+    packed = bytearray((len(values) + 7) // 8)
+    for i, value in enumerate(values):
+        if value:
+            packed[i >> 3] |= 1 << (i & 7)
+    return bytes(packed)
+
+
+def _unpackBits(data: bytes, count: int) -> bytearray:
+    return bytearray((data[i >> 3] >> (i & 7)) & 1 for i in range(count))
+
+
+def _writeVarint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _readVarint(data: bytes, offset: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class TriggerRecorder:
+    """
+    Records the value of a set of triggers and the robot mode on every tick, so a match can be
+    replayed offline with :class:`TriggerReplayer`.
+
+    The triggers are sampled when the button loop is polled: each recorded trigger reads its
+    condition the first time it is evaluated during a poll and returns that value for the rest of
+    the poll, so every binding of the trigger sees the same value during a tick, as it will on
+    replay. The values are recorded with the robot mode by a binding of the loop, so create the
+    recorder after the bindings of its triggers.
+
+    The recording is kept in memory and written by :meth:`save` in a columnar format: the sample
+    timestamps are delta-encoded, and the robot mode and trigger values are bit-packed columns.
+    """
+
+    def __init__(
+        self, triggers: Mapping[str, Trigger], loop: Optional[EventLoop] = None
+    ):
+        """
+        Starts recording triggers.
+
+        :param triggers: The triggers to record, by name. The names identify the triggers on
+                         replay.
+        :param loop:     The loop that polls the triggers, once per recorded tick. Defaults to the
+                         default scheduler button loop.
+        """
+        if loop is None:
+            loop = CommandScheduler.getInstance().getDefaultButtonLoop()
+
+        self._names = list(triggers)
+        self._triggers = list(triggers.values())
+        self._conditions = [trigger._condition for trigger in self._triggers]
+        self._values = [False] * len(self._triggers)
+        # Whether each value has been read during the current poll
+        self._sampled = [False] * len(self._triggers)
+        self._times = array("q")
+        self._columns = [bytearray() for _ in range(len(_modes) + len(self._names))]
+        self._recording = True
+
+        for i, trigger in enumerate(self._triggers):
+            trigger._condition = self._sampler(i)
+        loop.bind(self._record)
+
+    def _sampler(self, index: int) -> Callable[[], bool]:
+        values = self._values
+        sampled = self._sampled
+        condition = self._conditions[index]
+
+        def sample() -> bool:
+            if not sampled[index]:
+                values[index] = bool(condition())
+                sampled[index] = True
+            return values[index]
+
+        return sample
+
+    def _record(self) -> None:
+        if not self._recording:
+            return
+
+        self._times.append(RobotController.getFPGATime())
+        columns = self._columns
+        for column, mode in zip(columns, _modes):
+            column.append(mode())
+
+        values = self._values
+        sampled = self._sampled
+        for i, (column, condition) in enumerate(
+            zip(columns[len(_modes) :], self._conditions)
+        ):
+            # Triggers that were not evaluated during this poll are read now
+            if not sampled[i]:
+                values[i] = bool(condition())
+            sampled[i] = False
+            column.append(values[i])
+
+    def size(self) -> int:
+        """
+        Returns the number of recorded ticks.
+
+        :returns: the number of recorded polls of the loop
+        """
+        return len(self._times)
+
+    def save(self, filename: str) -> None:
+        """
+        Writes the recording to a file.
+
+        :param filename: The file to write.
+        """
+        data = bytearray(_header.pack(_magic, _version, self.size(), len(self._names)))
+        for name in self._names:
+            encoded = name.encode("utf-8")
+            data += struct.pack("<H", len(encoded))
+            data += encoded
+
+        times = self._times
+        data += struct.pack("<q", times[0] if times else 0)
+        for previous, current in zip(times, times[1:]):
+            _writeVarint(data, current - previous)
+
+        for column in self._columns:
+            data += _packBits(column)
+
+        with open(filename, "wb") as f:
+            f.write(data)
+
+    def close(self) -> None:
+        """Stops recording, and gives the triggers back their original conditions."""
+        self._recording = False
+        for trigger, condition in zip(self._triggers, self._conditions):
+            trigger._condition = condition
+
+
+class TriggerReplayer:
+    """
+    Replays a :class:`TriggerRecorder` recording: each tick, the triggers return their recorded
+    values and the simulated robot mode is set to the recorded one. With the recorded bindings
+    in place, this reproduces the command behavior of the recorded match, which also makes it a
+    benchmark of the scheduler with a real binding load.
+
+    The robot mode is set through :class:`wpilib.simulation.DriverStationSim`, so replays are
+    meant to run in simulation.
+    """
+
+    def __init__(self, filename: str, triggers: Mapping[str, Trigger]):
+        """
+        Loads a recording and takes over the conditions of the triggers.
+
+        :param filename: The recording, as written by :meth:`TriggerRecorder.save`.
+        :param triggers: The triggers to replay, by name. Each one must have been recorded.
+        """
+        with open(filename, "rb") as f:
+            data = f.read()
+
+        magic, version, ticks, count = _header.unpack_from(data)
+        if magic != _magic or version != _version:
+            raise ValueError(f"{filename} is not a trigger recording")
+        offset = _header.size
+
+        names: List[str] = []
+        for _ in range(count):
+            (length,) = struct.unpack_from("<H", data, offset)
+            offset += 2
+            names.append(data[offset : offset + length].decode("utf-8"))
+            offset += length
+
+        (start,) = struct.unpack_from("<q", data, offset)
+        offset += 8
+        self._deltas = array("q", [0])
+        for _ in range(ticks - 1):
+            delta, offset = _readVarint(data, offset)
+            self._deltas.append(delta)
+
+        columnSize = (ticks + 7) // 8
+        columns = []
+        for _ in range(len(_modes) + count):
+            columns.append(_unpackBits(data[offset : offset + columnSize], ticks))
+            offset += columnSize
+
+        self._modeColumns = columns[: len(_modes)]
+        self._mode: Optional[Tuple[int, ...]] = None
+
+        indices = {name: i for i, name in enumerate(names)}
+        missing = [name for name in triggers if name not in indices]
+        if missing:
+            raise ValueError(f"{filename} has no recording of {', '.join(missing)}")
+
+        self._ticks = ticks
+        self._tick = 0
+        self._triggers = list(triggers.values())
+        self._conditions = [trigger._condition for trigger in self._triggers]
+        self._columns = [columns[len(_modes) + indices[name]] for name in triggers]
+        self._values = [bool(column[0]) if ticks else False for column in self._columns]
+
+        for i, trigger in enumerate(self._triggers):
+            trigger._condition = _recordedValue(self._values, i)
+
+    def size(self) -> int:
+        """
+        Returns the number of recorded ticks.
+
+        :returns: the number of ticks in the recording
+        """
+        return self._ticks
+
+    def step(self) -> bool:
+        """
+        Moves to the next recorded tick: sets the trigger values and the robot mode, and steps the
+        simulated clock by the recorded period if timing is paused.
+
+        :returns: False if the recording has ended, True otherwise
+        """
+        tick = self._tick
+        if tick >= self._ticks:
+            return False
+        self._tick = tick + 1
+
+        values = self._values
+        for i, column in enumerate(self._columns):
+            values[i] = column[tick] == 1
+
+        mode = tuple(column[tick] for column in self._modeColumns)
+        if mode != self._mode:
+            self._mode = mode
+            enabled, autonomous, test, eStopped = mode
+            DriverStationSim.setEnabled(bool(enabled))
+            DriverStationSim.setAutonomous(bool(autonomous))
+            DriverStationSim.setTest(bool(test))
+            DriverStationSim.setEStop(bool(eStopped))
+            DriverStationSim.notifyNewData()
+
+        if tick > 0 and isTimingPaused():
+            stepTiming(self._deltas[tick] / 1e6)
+        return True
+
+    def run(self, scheduler: Optional[CommandScheduler] = None) -> int:
+        """
+        Replays the rest of the recording as fast as possible, running the scheduler once per
+        recorded tick. Timing is paused during the replay, so the simulated clock follows the
+        recorded timestamps.
+
+        :param scheduler: The scheduler to run. Defaults to the main scheduler.
+        :returns: the number of ticks replayed
+        """
+        if scheduler is None:
+            scheduler = CommandScheduler.getInstance()
+
+        paused = isTimingPaused()
+        if not paused:
+            pauseTiming()
+        try:
+            ticks = 0
+            while self.step():
+                scheduler.run()
+                ticks += 1
+        finally:
+            if not paused:
+                resumeTiming()
+        return ticks
+
+    def close(self) -> None:
+        """Stops replaying, and gives the triggers back their original conditions."""
+        for trigger, condition in zip(self._triggers, self._conditions):
+            trigger._condition = condition
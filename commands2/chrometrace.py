@@ -0,0 +1,128 @@
+# notrack
+"""
+Converts a :class:`.SchedulerTrace` recorded in a WPILog file to the Chrome Trace Event JSON
+format, which can be opened in ``chrome://tracing`` or https://ui.perfetto.dev to look at the
+scheduler ticks as a timeline. The ticks are only recorded by traces created with
+``profile=True``. Usage::
+
+    python -m commands2.chrometrace FRC_20240101_000000.wpilog -o trace.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .schedulertrace import TraceEvent, readTrace
+
+_slices = {
+    TraceEvent.kTickStart: "B",
+    TraceEvent.kTickEnd: "E",
+    TraceEvent.kPeriodicStart: "B",
+    TraceEvent.kPeriodicEnd: "E",
+    TraceEvent.kPollStart: "B",
+    TraceEvent.kPollEnd: "E",
+    TraceEvent.kExecuteStart: "B",
+    TraceEvent.kExecuteEnd: "E",
+}
+
+_instants = {
+    TraceEvent.kSchedule: "schedule",
+    TraceEvent.kInitialize: "initialize",
+    TraceEvent.kFinish: "finish",
+    TraceEvent.kInterrupt: "interrupt",
+    TraceEvent.kRequirement: "requirement",
+}
+
+
+def toChromeTrace(
+    names: Dict[int, Tuple[str, str]],
+    events: Sequence[Tuple[int, TraceEvent, int, int]],
+) -> Dict[str, Any]:
+    """
+    Converts trace events to a Chrome Trace Event document.
+
+    Ticks, subsystem periodic methods, button loop polls and command execute methods become
+    slices; the slices of a tick are nested under it, and the children executed by a command
+    group are nested under the group. The other lifecycle events become instant events.
+
+    :param names:  the names of the trace ids, as returned by :func:`.readTrace`
+    :param events: the events in time order, as returned by :func:`.readTrace`
+    :returns: the document, ready to be serialized with :func:`json.dump`
+    """
+
+    def nameOf(traceId: int) -> str:
+        entry = names.get(traceId)
+        return f"#{traceId}" if entry is None else entry[1]
+
+    traceEvents: List[Dict[str, Any]] = []
+    for timestamp, event, command, other in events:
+        phase = _slices.get(event)
+        args: Dict[str, Any] = {}
+
+        if phase is not None:
+            if event <= TraceEvent.kTickEnd:
+                category, name = "tick", "CommandScheduler.run()"
+            elif event <= TraceEvent.kPeriodicEnd:
+                category, name = "periodic", f"{nameOf(other)}.periodic()"
+            elif event <= TraceEvent.kPollEnd:
+                category, name = "poll", "buttons.run()"
+            else:
+                category, name = "execute", f"{nameOf(command)}.execute()"
+                if other != -1:
+                    args["parent"] = nameOf(other)
+        else:
+            phase = "i"
+            category = "lifecycle"
+            name = f"{nameOf(command)}.{_instants[event]}"
+            if other != -1:
+                args[
+                    "subsystem" if event == TraceEvent.kRequirement else "interruptor"
+                ] = nameOf(other)
+
+        traceEvent: Dict[str, Any] = {
+            "name": name,
+            "cat": category,
+            "ph": phase,
+            "ts": timestamp,
+            "pid": 0,
+            "tid": 0,
+        }
+        if phase == "i":
+            traceEvent["s"] = "t"
+        if args:
+            traceEvent["args"] = args
+        traceEvents.append(traceEvent)
+
+    return {"traceEvents": traceEvents, "displayTimeUnit": "ms"}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m commands2.chrometrace",
+        description="Convert a scheduler trace in a WPILog file to Chrome Trace Event JSON.",
+    )
+    parser.add_argument("log", help="the WPILog file to read")
+    parser.add_argument(
+        "-o", "--output", help="the JSON file to write (default: standard output)"
+    )
+    parser.add_argument(
+        "--name", default="scheduler", help="the prefix of the trace entries"
+    )
+    args = parser.parse_args(argv)
+
+    names, events = readTrace(args.log, args.name)
+    document = toChromeTrace(names, events)
+
+    if args.output is None:
+        json.dump(document, sys.stdout)
+    else:
+        with open(args.output, "w") as f:
+            json.dump(document, f)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,7 @@
 from __future__ import annotations
 
 from enum import Enum
-from typing import TYPE_CHECKING, Any, Callable, Set, Union
+from typing import TYPE_CHECKING, Any, Callable, Optional, Set, Union
 
 from typing_extensions import Self, TypeAlias
 
@@ -111,6 +111,19 @@ class Command(Sendable):
         """
         return self.requirements
 
+    def _prepareToSchedule(self) -> None:
+        """
+        python-only: called by the scheduler when this command is about to be scheduled, before
+        its requirements are read. Commands whose requirements depend on runtime state settle
+        on them here, until :meth:`_finishScheduling` is called.
+        """
+
+    def _finishScheduling(self) -> None:
+        """
+        python-only: called by the scheduler after an attempt to schedule this command, whether
+        or not the command was scheduled.
+        """
+
     def addRequirements(self, *requirements: Subsystem):
         """
         Adds the specified subsystems to the requirements of the command. The scheduler will prevent
@@ -509,6 +522,30 @@ class Command(Sendable):
 
         return CommandScheduler.getInstance().isScheduled(self)
 
+    def setExecuteRate(self, hz: float, phase: Optional[int] = None) -> None:
+        """
+        Runs this command's execute and isFinished methods at a lower rate than the scheduler
+        while it is scheduled. See :func:`commands2.CommandScheduler.setRate`.
+
+        :param hz:    the rate to run the command at, in Hz
+        :param phase: the tick offset to run on; by default, the least loaded offset is picked
+        """
+        from .commandscheduler import CommandScheduler
+
+        CommandScheduler.getInstance().setRate(self, hz, phase)
+
+    def setPriority(self, priority: int) -> None:
+        """
+        Sets the priority of this command's execute and isFinished methods. Low-priority work can
+        be deferred when the scheduler runs out of budget. See
+        :func:`commands2.CommandScheduler.setDeferralThreshold`.
+
+        :param priority: the priority; higher values are more important
+        """
+        from .commandscheduler import CommandScheduler
+
+        CommandScheduler.getInstance().setPriority(self, priority)
+
     def hasRequirement(self, requirement: Subsystem) -> bool:
         """
         Whether the command requires a given subsystem.
@@ -2,9 +2,25 @@
 from __future__ import annotations
 
 import inspect
+import math
 import os.path
+import re
 import traceback
-from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Union
+from collections import deque
+from types import SimpleNamespace
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
 import hal
 from typing_extensions import Self
@@ -13,7 +29,9 @@ from wpilib import (
     RobotBase,
     RobotState,
     TimedRobot,
+    Timer,
     Watchdog,
+    reportError,
     reportWarning,
 )
 from wpilib.event import EventLoop
@@ -21,11 +39,39 @@ from wpiutil import Sendable, SendableBuilder, SendableRegistry
 
 from .command import Command, InterruptionBehavior
 from .exceptions import IllegalCommandUse
+from .schedulertrace import SchedulerTrace, TraceEvent
 from .subsystem import Subsystem
 
 _cmd_path = os.path.dirname(__file__)
 
 
+class _CommandListeners:
+    """The scheduler event actions that apply to a scheduled command."""
+
+    __slots__ = ("initialize", "execute", "interrupt", "finish")
+
+    def __init__(self) -> None:
+        self.initialize: List[Callable[[Command], Any]] = []
+        self.execute: List[Callable[[Command], Any]] = []
+        # Both onCommandInterrupt and onCommandInterruptWithCause actions, in the order
+        # they were added, with whether they take the interrupting command
+        self.interrupt: List[Tuple[Callable[..., Any], bool]] = []
+        self.finish: List[Callable[[Command], Any]] = []
+
+    def add(self, event: str, action: Callable[..., Any]) -> None:
+        if event == "interrupt":
+            self.interrupt.append((action, False))
+        elif event == "interruptWithCause":
+            self.interrupt.append((action, True))
+        else:
+            getattr(self, event).append(action)
+
+
+# A filter on the commands a scheduler event action applies to, given the command and
+# the requirements it was scheduled with. None applies to every command.
+_CommandFilter = Optional[Callable[[Command, Iterable[Subsystem]], bool]]
+
+
 class CommandScheduler(Sendable):
     """
     The scheduler responsible for running Commands. A Command-based robot should call
@@ -35,6 +81,9 @@ class CommandScheduler(Sendable):
     """
 
     _instance: Optional[CommandScheduler] = None
+    _namedInstances: Dict[str, CommandScheduler] = {}
+    # A map from the subsystems registered with a named instance to that instance
+    _subsystemOwners: Dict[Subsystem, CommandScheduler] = {}
 
     def __new__(cls) -> CommandScheduler:
         if cls._instance is None:
@@ -50,11 +99,42 @@ class CommandScheduler(Sendable):
         """
         return CommandScheduler()
 
+    @staticmethod
+    def getNamedInstance(name: str) -> CommandScheduler:
+        """
+        Returns a secondary scheduler instance with the given name, creating it on first use.
+
+        Secondary schedulers have their own subsystems, requirements and button loop, and are run
+        separately from the main instance, usually at a different rate (see
+        :meth:`commands2.TimedCommandRobot.addScheduler`). A subsystem belongs to a single
+        scheduler: registering it with a secondary scheduler moves it away from the main instance,
+        which every subsystem is registered with when it is created.
+
+        Commands are run by the scheduler owning their requirements, whichever instance they are
+        scheduled or cancelled through. Commands without requirements run on the instance they are
+        scheduled with. A command whose requirements are registered with different schedulers is
+        only detected when it is scheduled: the error is reported to the Driver Station and the
+        command is not scheduled.
+
+        The ``onCommand*`` actions, the trace set with :meth:`.setTrace` and the other per-instance
+        settings of the main instance do not apply to the commands run by a named instance; set
+        them on the named instance as well.
+
+        :param name: the name of the scheduler
+        :returns: the named instance
+        """
+        inst = CommandScheduler._namedInstances.get(name)
+        if inst is None:
+            inst = Sendable.__new__(CommandScheduler)
+            Sendable.__init__(inst)
+            inst._init(name)
+        return inst
+
     @staticmethod
     def resetInstance() -> None:
         """
-        Resets the scheduler instance, which is useful for testing purposes. This should not be
-        called by user code.
+        Resets the scheduler instance and removes all named instances, which is useful for testing
+        purposes. This should not be called by user code.
         """
         inst = CommandScheduler._instance
         if inst:
@@ -63,7 +143,13 @@ class CommandScheduler(Sendable):
             LiveWindow.setDisabledCallback(lambda: None)
             SendableRegistry.remove(inst)
 
+        for named in CommandScheduler._namedInstances.values():
+            named._defaultButtonLoop.clear()
+            SendableRegistry.remove(named)
+
         CommandScheduler._instance = None
+        CommandScheduler._namedInstances.clear()
+        CommandScheduler._subsystemOwners.clear()
 
     def __init__(self) -> None:
         """
@@ -73,10 +159,28 @@ class CommandScheduler(Sendable):
         if CommandScheduler._instance is not None:
             return
         CommandScheduler._instance = self
-        self._composedCommands: Dict[Command, str] = {}
+        self._init(None)
 
-        # A set of the currently-running commands.
-        self._scheduledCommands: Dict[Command, None] = {}
+    def _init(self, name: Optional[str]) -> None:
+        self._name = name
+        if name is None:
+            self._composedCommands: Dict[Command, str] = {}
+        else:
+            # Compositions are registered with the main instance, share them
+            CommandScheduler._namedInstances[name] = self
+            self._composedCommands = CommandScheduler.getInstance()._composedCommands
+
+        # A map from the currently-running commands to the requirements they were
+        # scheduled with. Also used as a set of the currently-running commands.
+        self._scheduledCommands: Dict[Command, Iterable[Subsystem]] = {}
+        # Bumped whenever a command is scheduled or removed, so the dashboard properties
+        # are only rebuilt when the scheduled commands change.
+        self._scheduledVersion = 0
+
+        # The currently-running commands that don't run when disabled, and whether the
+        # robot was disabled on the last run.
+        self._cancelOnDisable: Set[Command] = set()
+        self._wasDisabled = False
 
         # A map from required subsystems to their requiring commands. Also used as a set
         # of the currently-required subsystems.
@@ -86,6 +190,16 @@ class CommandScheduler(Sendable):
         # Also used as a list of currently-registered subsystems.
         self._subsystems: Dict[Subsystem, Optional[Command]] = {}
 
+        # The subsystems whose default command may need to be scheduled: those that were
+        # released or had their default command set since the last check, and those whose
+        # default command could not be scheduled yet.
+        self._pendingDefaults: Dict[Subsystem, None] = {}
+
+        # The registered subsystems that override periodic or simulationPeriodic, with which
+        # ones they override. None when it must be recomputed.
+        self._periodicSubsystems: Optional[List[Tuple[Subsystem, bool, bool]]] = None
+        self._isSimulation = RobotBase.isSimulation()
+
         self._defaultButtonLoop = EventLoop()
 
         # The set of currently-registered buttons that will be polled every iteration.
@@ -93,12 +207,17 @@ class CommandScheduler(Sendable):
 
         self._disabled = False
 
-        # Lists of user-supplied actions to be executed on scheduling events for every
-        # command.
-        self._initActions: List[Callable[[Command], None]] = []
-        self._executeActions: List[Callable[[Command], None]] = []
-        self._interruptActions: List[Callable[[Command, Optional[Command]], None]] = []
-        self._finishActions: List[Callable[[Command], None]] = []
+        # User-supplied actions to be executed on scheduling events, as (event, action,
+        # filter) in the order they were added. The actions that apply to each scheduled
+        # command are resolved when it is scheduled; commands share _allCommandListeners
+        # while no action is filtered.
+        self._subscriptions: List[Tuple[str, Callable[..., Any], _CommandFilter]] = []
+        self._filteredSubscriptions = False
+        self._allCommandListeners = _CommandListeners()
+        self._commandListeners: Dict[Command, _CommandListeners] = {}
+        self._executedActions: List[Callable[[List[Command]], Any]] = []
+
+        self._trace: Optional[SchedulerTrace] = None
 
         self._inRunLoop = False
         self._toSchedule: Dict[Command, None] = {}
@@ -107,7 +226,34 @@ class CommandScheduler(Sendable):
         # self._toCancelInterruptors: List[Optional[Command]] = []
         self._endingCommands: Set[Command] = set()
 
-        self._watchdog = Watchdog(TimedRobot.kDefaultPeriod, lambda: None)
+        # Commands submitted from other threads, as (schedule or cancel, command, submission
+        # time). Appending to and popping from a deque are atomic, so producers never lock.
+        self._submissions: Deque[Tuple[bool, Command, float]] = deque()
+        self._submissionLatency = 0.0
+        self._maxSubmissionLatency = 0.0
+
+        # python: kDefaultPeriod is in milliseconds
+        self._period = TimedRobot.kDefaultPeriod / 1000
+        self._watchdog = Watchdog(self._period, lambda: None)
+
+        # The number of times run() has been called, used to stagger reduced-rate work.
+        self._tick = 0
+        # A map from the subsystems and commands that run at a reduced rate to their
+        # (divisor, phase): they only run on ticks where tick % divisor == phase.
+        self._rates: Dict[Union[Subsystem, Command], Tuple[int, int]] = {}
+
+        # Deferral of low-priority work when a tick runs out of budget. None when disabled.
+        self._deferralThreshold: Optional[float] = None
+        self._deferralPriority = 0
+        self._priorities: Dict[Union[Subsystem, Command], int] = {}
+        self._deferralCounts: Dict[Union[Subsystem, Command], int] = {}
+        # Targets that were deferred and have not run since. They run on their next tick,
+        # whatever their rate.
+        self._deferred: Set[Union[Subsystem, Command]] = set()
+
+        if name is not None:
+            SendableRegistry.addLW(self, f"Scheduler {name}")
+            return
 
         hal.report(
             hal.tResourceType.kResourceType_Command.value,
@@ -117,10 +263,17 @@ class CommandScheduler(Sendable):
 
         def _on_lw_enabled():
             self.disable()
+            for named in CommandScheduler._namedInstances.values():
+                named.disable()
             self.cancelAll()
 
+        def _on_lw_disabled():
+            self.enable()
+            for named in CommandScheduler._namedInstances.values():
+                named.enable()
+
         LiveWindow.setEnabledCallback(_on_lw_enabled)
-        LiveWindow.setDisabledCallback(self.enable)
+        LiveWindow.setDisabledCallback(_on_lw_disabled)
 
     def setPeriod(self, period: float) -> None:
         """
@@ -129,8 +282,162 @@ class CommandScheduler(Sendable):
 
         :param period: Period in seconds.
         """
+        self._period = period
         self._watchdog.setTimeout(period)
 
+    def setRate(
+        self,
+        target: Union[Subsystem, Command],
+        hz: float,
+        phase: Optional[int] = None,
+    ) -> None:
+        """
+        Runs a subsystem's periodic methods, or a command's execute and isFinished methods, at a
+        lower rate than the scheduler. The rate is rounded to a whole number of scheduler ticks,
+        based on the period given to :meth:`.setPeriod`; rates at or above the scheduler rate run
+        every tick.
+
+        Targets with the same divisor are spread across ticks so that their load does not land on
+        the same tick, unless an explicit phase is given.
+
+        :param target: the subsystem or command to slow down
+        :param hz:     the rate to run it at, in Hz
+        :param phase:  the tick offset within the divisor to run it on; by default, the least
+                       loaded offset is picked
+        """
+        owner = self._targetOwner(target)
+        if owner is not self:
+            return owner.setRate(target, hz, phase)
+
+        assert hz > 0
+        self._rates.pop(target, None)
+
+        divisor = max(1, round(1.0 / (hz * self._period)))
+        if divisor == 1:
+            return
+
+        if phase is None:
+            # Pick the phase that collides least often with the other reduced-rate targets
+            def collisions(candidate: int) -> float:
+                load = 0.0
+                for otherDivisor, otherPhase in self._rates.values():
+                    gcd = math.gcd(divisor, otherDivisor)
+                    if (candidate - otherPhase) % gcd == 0:
+                        load += gcd / otherDivisor
+                return load
+
+            phase = min(range(divisor), key=collisions)
+
+        self._rates[target] = (divisor, phase % divisor)
+
+    def clearRate(self, target: Union[Subsystem, Command]) -> None:
+        """
+        Runs a subsystem or command at the full scheduler rate again.
+
+        :param target: the subsystem or command
+        """
+        owner = self._targetOwner(target)
+        if owner is not self:
+            return owner.clearRate(target)
+
+        self._rates.pop(target, None)
+
+    def getRate(self, target: Union[Subsystem, Command]) -> Tuple[int, int]:
+        """
+        Gets the tick divisor and phase a subsystem or command runs at.
+
+        :param target: the subsystem or command
+        :returns: the (divisor, phase) of the target; (1, 0) if it runs every tick
+        """
+        owner = self._targetOwner(target)
+        if owner is not self:
+            return owner.getRate(target)
+
+        return self._rates.get(target, (1, 0))
+
+    def setPriority(self, target: Union[Subsystem, Command], priority: int) -> None:
+        """
+        Sets the priority of a subsystem's periodic methods or of a command's execute and
+        isFinished methods. Subsystems and commands have a priority of 0 by default. Work with a
+        low priority can be deferred when a tick runs out of budget, see
+        :meth:`.setDeferralThreshold`.
+
+        :param target:   the subsystem or command
+        :param priority: the priority; higher values are more important
+        """
+        owner = self._targetOwner(target)
+        if owner is not self:
+            return owner.setPriority(target, priority)
+
+        if priority == 0:
+            self._priorities.pop(target, None)
+        else:
+            self._priorities[target] = priority
+
+    def getPriority(self, target: Union[Subsystem, Command]) -> int:
+        """
+        Gets the priority of a subsystem or command.
+
+        :param target: the subsystem or command
+        :returns: the priority of the target
+        """
+        owner = self._targetOwner(target)
+        if owner is not self:
+            return owner.getPriority(target)
+
+        return self._priorities.get(target, 0)
+
+    def setDeferralThreshold(self, seconds: Optional[float], priority: int = 0) -> None:
+        """
+        Enables deferring low-priority work when a tick runs long. Once less than ``seconds``
+        remain in the scheduler period, subsystems and commands with a priority below ``priority``
+        are skipped for the rest of the tick and run on the next one instead.
+
+        Work that was deferred on a tick is never deferred on the tick right after it, and runs on
+        that tick even if it was slowed down with :meth:`.setRate`, so low-priority work still runs
+        at least every other tick when the robot is overloaded.
+
+        :param seconds:  the remaining budget below which low-priority work is deferred, or
+                         None to never defer work
+        :param priority: the priority below which work may be deferred
+        """
+        assert seconds is None or seconds >= 0
+        self._deferralThreshold = seconds
+        self._deferralPriority = priority
+
+    def getDeferralCount(self, target: Union[Subsystem, Command]) -> int:
+        """
+        Gets the number of times a subsystem or command has been deferred.
+
+        :param target: the subsystem or command
+        :returns: the number of ticks the target was deferred on
+        """
+        owner = self._targetOwner(target)
+        if owner is not self:
+            return owner.getDeferralCount(target)
+
+        return self._deferralCounts.get(target, 0)
+
+    def getDeferralCounts(self) -> Dict[Union[Subsystem, Command], int]:
+        """
+        Gets the number of times each subsystem or command has been deferred.
+
+        :returns: a map from every target that was deferred to its number of deferrals
+        """
+        return dict(self._deferralCounts)
+
+    def _defer(self, target: Union[Subsystem, Command], deadline: float) -> bool:
+        """Returns whether the target must be deferred, and counts it if it is."""
+        if (
+            self._priorities.get(target, 0) >= self._deferralPriority
+            or target in self._deferred
+            or Timer.getFPGATimestamp() < deadline
+        ):
+            return False
+        self._deferred.add(target)
+        self._deferralCounts[target] = self._deferralCounts.get(target, 0) + 1
+        return True
+
     def getDefaultButtonLoop(self) -> EventLoop:
         """
         Get the default button poll.
@@ -155,6 +462,39 @@ class CommandScheduler(Sendable):
         """
         self._activeButtonLoop = loop
 
+    def _owner(self, subsystem: Subsystem) -> CommandScheduler:
+        """Returns the scheduler that a subsystem is registered with."""
+        owner = CommandScheduler._subsystemOwners.get(subsystem)
+        if owner is None:
+            return CommandScheduler._instance or CommandScheduler.getInstance()
+        return owner
+
+    def _schedulerFor(self, command: Command) -> Optional[CommandScheduler]:
+        """
+        Returns the scheduler that runs a command, based on its requirements, or None if its
+        requirements are registered with different schedulers.
+        """
+        if not CommandScheduler._subsystemOwners:
+            return self
+
+        owners = {self._owner(requirement) for requirement in command.getRequirements()}
+        if not owners:
+            return self
+        if len(owners) > 1:
+            return None
+        return owners.pop()
+
+    def _targetOwner(self, target: Union[Subsystem, Command]) -> CommandScheduler:
+        if isinstance(target, Subsystem):
+            return self._owner(target)
+        owner = self._schedulerFor(target)
+        if owner is None:
+            raise IllegalCommandUse(
+                "Commands may not require subsystems registered with different schedulers",
+                command=target,
+            )
+        return owner
+
     def _initCommand(self, command: Command, *requirements: Subsystem) -> None:
         """
         Initializes a given command, adds its requirements to the list, and performs the init actions.
@@ -162,11 +502,18 @@ class CommandScheduler(Sendable):
         :param command: The command to initialize
         :param requirements: The command requirements
         """
-        self._scheduledCommands[command] = None
+        self._scheduledCommands[command] = requirements
+        self._scheduledVersion += 1
         for requirement in requirements:
             self._requirements[requirement] = command
+        if not command.runsWhenDisabled():
+            self._cancelOnDisable.add(command)
+        listeners = self._resolveListeners(command, requirements)
+        self._commandListeners[command] = listeners
         command.initialize()
-        for action in self._initActions:
+        if self._trace is not None:
+            self._trace.record(TraceEvent.kInitialize, command)
+        for action in listeners.initialize:
             action(command)
         self._watchdog.addEpoch(f"{command.getName()}.initialize()")
 
@@ -183,7 +530,20 @@ class CommandScheduler(Sendable):
         :param commands: the commands to schedule.
         """
         for command in commands:
-            self._schedule(command)
+            if command is None:
+                self._schedule(command)
+                continue
+
+            scheduler = self._schedulerFor(command)
+            if scheduler is None:
+                # Raising here could end the robot loop when called from a trigger binding
+                reportError(
+                    f"Command {command.getName()} requires subsystems registered with "
+                    "different schedulers, and was not scheduled",
+                    True,
+                )
+                continue
+            scheduler._schedule(command)
 
     def _schedule(self, command: Optional[Command]) -> None:
         if command is None:
@@ -205,13 +565,26 @@ class CommandScheduler(Sendable):
         if self.isScheduled(command):
             return
 
+        # Commands whose requirements depend on runtime state (such as SelectCommand)
+        # settle on them for the duration of the scheduling attempt.
+        command._prepareToSchedule()
+        try:
+            self._scheduleNow(command)
+        finally:
+            command._finishScheduling()
+
+    def _scheduleNow(self, command: Command) -> None:
+        requirements = command.getRequirements()
+
         if RobotState.isDisabled() and not command.runsWhenDisabled():
             return
 
-        requirements = command.getRequirements()
+        trace = self._trace
 
         # Schedule the command if the requirements are not currently in-use.
         if self._requirements.keys().isdisjoint(requirements):
+            if trace is not None:
+                trace.record(TraceEvent.kSchedule, command)
             self._initCommand(command, *requirements)
         else:
             # Else check if the requirements that are in use have all have interruptible
@@ -226,10 +599,15 @@ class CommandScheduler(Sendable):
                 ):
                     return
 
+            if trace is not None:
+                trace.record(TraceEvent.kSchedule, command)
+
             for requirement in requirements:
                 requiringCommand = self.requiring(requirement)
                 if requiringCommand is not None:
                     self._cancel(requiringCommand, command)
+                    if trace is not None:
+                        trace.record(TraceEvent.kRequirement, command, requirement)
 
             self._initCommand(command, *requirements)
 
@@ -239,54 +617,143 @@ class CommandScheduler(Sendable):
 
         * Subsystem periodic methods are called.
         * Button bindings are polled, and new commands are scheduled from them.
+        * Commands submitted from other threads are scheduled or canceled.
         * Currently-scheduled commands are executed.
         * End conditions are checked on currently-scheduled commands, and commands that are finished
           have their end methods called and are removed.
         * Any subsystems not being used as requirements have their default methods started.
+
+        Subsystems and commands slowed down with :meth:`.setRate` are skipped on ticks that are not
+        theirs, and low-priority work is skipped when the tick runs out of budget (see
+        :meth:`.setDeferralThreshold`).
         """
         if self._disabled:
             return
         self._watchdog.reset()
 
-        # Run the periodic method of all registered subsystems.
-        for subsystem in self._subsystems:
-            subsystem.periodic()
-            if RobotBase.isSimulation():
+        trace = self._trace
+        # The trace that records the tick slices, if any
+        profile = trace if trace is not None and trace.profile else None
+        if profile is not None:
+            profile.record(TraceEvent.kTickStart)
+
+        tick = self._tick
+        self._tick += 1
+        rates = self._rates
+
+        threshold = self._deferralThreshold
+        deferring = threshold is not None
+        if threshold is not None:
+            deadline = Timer.getFPGATimestamp() + self._period - threshold
+        deferred = self._deferred
+
+        periodicSubsystems = self._periodicSubsystems
+        if periodicSubsystems is None:
+            periodicSubsystems = self._periodicSubsystems = self._findPeriodics()
+
+        # Run the periodic method of all registered subsystems that have one.
+        for subsystem, periodic, simulationPeriodic in periodicSubsystems:
+            if rates:
+                rate = rates.get(subsystem)
+                if (
+                    rate is not None
+                    and tick % rate[0] != rate[1]
+                    and subsystem not in deferred
+                ):
+                    continue
+            if deferring and self._defer(subsystem, deadline):
+                continue
+            if deferred:
+                deferred.discard(subsystem)
+            if profile is not None:
+                profile.record(TraceEvent.kPeriodicStart, None, subsystem)
+            if periodic:
+                subsystem.periodic()
+            if simulationPeriodic:
                 subsystem.simulationPeriodic()
+            if profile is not None:
+                profile.record(TraceEvent.kPeriodicEnd, None, subsystem)
             self._watchdog.addEpoch(f"{subsystem.getName()}.periodic()")
 
         # Cache the active instance to avoid concurrency problems if setActiveLoop() is
         # called from inside the button bindings.
         loopCache = self._activeButtonLoop
         # Poll buttons for new commands to add.
+        if profile is not None:
+            profile.record(TraceEvent.kPollStart)
         loopCache.poll()
+        if profile is not None:
+            profile.record(TraceEvent.kPollEnd)
         self._watchdog.addEpoch("buttons.run()")
 
-        self._inRunLoop = True
+        # Apply the commands submitted from other threads.
+        if self._submissions:
+            self._drainSubmissions()
+            self._watchdog.addEpoch("submissions")
+
+        # Cancel the commands that don't run when disabled once, when the robot gets disabled.
+        # They cannot be scheduled while it stays disabled.
         isDisabled = RobotState.isDisabled()
+        if isDisabled and not self._wasDisabled:
+            for command in list(self._cancelOnDisable):
+                self._cancel(command, None)
+        self._wasDisabled = isDisabled
+
+        self._inRunLoop = True
+        SchedulerTrace.current = profile
+        commandListeners = self._commandListeners
+        executed: Optional[List[Command]] = [] if self._executedActions else None
 
         # Run scheduled commands, remove finished commands.
         for command in self._scheduledCommands.copy():
-            if isDisabled and not command.runsWhenDisabled():
-                self._cancel(command, None)
+            if rates:
+                rate = rates.get(command)
+                if (
+                    rate is not None
+                    and tick % rate[0] != rate[1]
+                    and command not in deferred
+                ):
+                    continue
+
+            if deferring and self._defer(command, deadline):
                 continue
+            if deferred:
+                deferred.discard(command)
 
+            listeners = commandListeners[command]
+            if profile is not None:
+                profile.record(TraceEvent.kExecuteStart, command)
             command.execute()
-            for action in self._executeActions:
-                action(command)
+            if profile is not None:
+                profile.record(TraceEvent.kExecuteEnd, command)
+            for executeAction in listeners.execute:
+                executeAction(command)
+            if executed is not None:
+                executed.append(command)
             self._watchdog.addEpoch(f"{command.getName()}.execute()")
             if command.isFinished():
                 self._endingCommands.add(command)
                 command.end(False)
-                for action in self._finishActions:
-                    action(command)
+                if self._trace is not None:
+                    self._trace.record(TraceEvent.kFinish, command)
+                for finishAction in listeners.finish:
+                    finishAction(command)
                 self._endingCommands.remove(command)
-                self._scheduledCommands.pop(command)
-                for requirement in command.getRequirements():
+                self._cancelOnDisable.discard(command)
+                deferred.discard(command)
+                del commandListeners[command]
+                for requirement in self._scheduledCommands.pop(command):
                     self._requirements.pop(requirement)
+                    self._pendingDefaults[requirement] = None
+                self._scheduledVersion += 1
                 self._watchdog.addEpoch(f"{command.getName()}.end(False)")
 
         self._inRunLoop = False
+        SchedulerTrace.current = None
+
+        if executed is not None:
+            for executedAction in self._executedActions:
+                executedAction(executed)
 
         # Schedule/cancel commands from queues populated during loop
         for command in self._toSchedule:
@@ -298,21 +765,60 @@ class CommandScheduler(Sendable):
         self._toSchedule.clear()
         self._toCancel.clear()
 
-        # Add default commands for un-required registered subsystems.
-        for subsystem, scommand in self._subsystems.items():
-            if subsystem not in self._requirements and scommand is not None:
+        # Add default commands for un-required registered subsystems. Only the subsystems
+        # that were released or had their default command changed need to be checked.
+        if self._pendingDefaults:
+            pending = self._pendingDefaults
+            self._pendingDefaults = {}
+            for subsystem in pending:
+                scommand = self._subsystems.get(subsystem)
+                if scommand is None or subsystem in self._requirements:
+                    continue
                 self._schedule(scommand)
+                if subsystem not in self._requirements:
+                    # Not schedulable right now (e.g. disabled), try again next time
+                    self._pendingDefaults[subsystem] = None
+
+        if trace is not None:
+            if profile is not None:
+                profile.record(TraceEvent.kTickEnd)
+            trace.tick()
 
         self._watchdog.disable()
         if self._watchdog.isExpired():
             self._watchdog.printEpochs()
 
+    def _findPeriodics(self) -> List[Tuple[Subsystem, bool, bool]]:
+        """
+        Lists the registered subsystems that override periodic or (in simulation)
+        simulationPeriodic, with which of the two they override.
+        """
+
+        def overrides(subsystem: Subsystem, name: str) -> bool:
+            return name in vars(subsystem) or (
+                getattr(type(subsystem), name) is not getattr(Subsystem, name)
+            )
+
+        periodics = []
+        for subsystem in self._subsystems:
+            periodic = overrides(subsystem, "periodic")
+            simulationPeriodic = self._isSimulation and overrides(
+                subsystem, "simulationPeriodic"
+            )
+            if periodic or simulationPeriodic:
+                periodics.append((subsystem, periodic, simulationPeriodic))
+        return periodics
+
     def registerSubsystem(self, *subsystems: Subsystem) -> None:
         """
         Registers subsystems with the scheduler. This must be called for the subsystem's periodic block
         to run when the scheduler is run, and for the subsystem's default command to be scheduled. It
         is recommended to call this from the constructor of your subsystem implementations.
 
+        Only the subsystems that override :meth:`commands2.Subsystem.periodic` or
+        :meth:`commands2.Subsystem.simulationPeriodic` have them called. Overrides are detected
+        the next time the scheduler runs after subsystems are registered or unregistered.
+
         :param subsystems: the subsystem to register
         """
         for subsystem in subsystems:
@@ -322,7 +828,26 @@ class CommandScheduler(Sendable):
             if subsystem in self._subsystems:
                 reportWarning("Tried to register an already-registered subsystem", True)
                 continue
+
+            owner = self._owner(subsystem)
+            if owner is not self and (
+                self._name is None
+                or owner._name is not None
+                or subsystem in owner._requirements
+                or owner._subsystems.get(subsystem) is not None
+            ):
+                raise IllegalCommandUse(
+                    "Subsystems may only be registered with one scheduler, and cannot be moved "
+                    "once in use",
+                    subsystem=subsystem,
+                )
+
+            if owner is not self:
+                # Subsystems are registered with the main instance when created, move it
+                owner.unregisterSubsystem(subsystem)
+                CommandScheduler._subsystemOwners[subsystem] = self
             self._subsystems[subsystem] = None
+            self._periodicSubsystems = None
 
     def unregisterSubsystem(self, *subsystems: Subsystem) -> None:
         """
@@ -332,7 +857,13 @@ class CommandScheduler(Sendable):
         :param subsystems: the subsystem to un-register
         """
         for subsystem in subsystems:
+            if subsystem in self._subsystems and self._name is not None:
+                del CommandScheduler._subsystemOwners[subsystem]
             self._subsystems.pop(subsystem, None)
+            self._periodicSubsystems = None
+            self._rates.pop(subsystem, None)
+            self._priorities.pop(subsystem, None)
+            self._deferred.discard(subsystem)
 
     def unregisterAllSubsystems(self):
         """
@@ -340,7 +871,7 @@ class CommandScheduler(Sendable):
         will no longer have their periodic block called, and will not have their default command
         scheduled.
         """
-        self._subsystems.clear()
+        self.unregisterSubsystem(*self._subsystems)
 
     def setDefaultCommand(self, subsystem: Subsystem, defaultCommand: Command) -> None:
         """
@@ -353,6 +884,10 @@ class CommandScheduler(Sendable):
         :param subsystem: the subsystem whose default command will be set
         :param defaultCommand: the default command to associate with the subsystem
         """
+        owner = self._owner(subsystem)
+        if owner is not self:
+            return owner.setDefaultCommand(subsystem, defaultCommand)
+
         if subsystem is None:
             reportWarning("Tried to set a default command for a null subsystem", True)
             return
@@ -380,6 +915,7 @@ class CommandScheduler(Sendable):
             # Warn, but allow -- there might be a use case for this.
 
         self._subsystems[subsystem] = defaultCommand
+        self._pendingDefaults[subsystem] = None
 
     def removeDefaultCommand(self, subsystem: Subsystem) -> None:
         """
@@ -389,6 +925,10 @@ class CommandScheduler(Sendable):
 
         :param subsystem: the subsystem whose default command will be removed
         """
+        owner = self._owner(subsystem)
+        if owner is not self:
+            return owner.removeDefaultCommand(subsystem)
+
         if subsystem is None:
             reportWarning(
                 "Tried to remove a default command for a null subsystem", True
@@ -405,6 +945,10 @@ class CommandScheduler(Sendable):
         :param subsystem: the subsystem to inquire about
         :returns: the default command associated with the subsystem
         """
+        owner = self._owner(subsystem)
+        if owner is not self:
+            return owner.getDefaultCommand(subsystem)
+
         return self._subsystems[subsystem]
 
     def cancel(
@@ -421,7 +965,14 @@ class CommandScheduler(Sendable):
         :param commands: the commands to cancel
         """
         for command in commands:
-            self._cancel(command, None)
+            if command is None:
+                self._cancel(command, None)
+                continue
+
+            # Commands whose requirements span schedulers cannot be scheduled
+            scheduler = self._schedulerFor(command)
+            if scheduler is not None:
+                scheduler._cancel(command, None)
 
     def _cancel(self, command: Command, interruptor: Optional[Command]):
         if command is None:
@@ -440,18 +991,99 @@ class CommandScheduler(Sendable):
 
         self._endingCommands.add(command)
         command.end(True)
-        for action in self._interruptActions:
-            action(command, interruptor)
+        if self._trace is not None:
+            self._trace.record(TraceEvent.kInterrupt, command, interruptor)
+        listeners = self._commandListeners.pop(command)
+        for interruptAction, withCause in listeners.interrupt:
+            if withCause:
+                interruptAction(command, interruptor)
+            else:
+                interruptAction(command)
 
         self._endingCommands.remove(command)
-        self._scheduledCommands.pop(command)
-        for requirement in command.getRequirements():
+        self._cancelOnDisable.discard(command)
+        self._deferred.discard(command)
+        for requirement in self._scheduledCommands.pop(command):
             del self._requirements[requirement]
+            self._pendingDefaults[requirement] = None
+        self._scheduledVersion += 1
         self._watchdog.addEpoch(f"{command.getName()}.end(true)")
 
     def cancelAll(self) -> None:
-        """Cancels all commands that are currently scheduled."""
+        """
+        Cancels all commands that are currently scheduled. On the main instance, this includes the
+        commands run by the named instances.
+        """
         self.cancel(*self._scheduledCommands)
+        if self._name is None:
+            for named in CommandScheduler._namedInstances.values():
+                named.cancel(*named._scheduledCommands)
+
+    def scheduleFromThread(self, *commands: Command) -> None:
+        """
+        Schedules commands from any thread, such as a vision thread or a NetworkTables listener.
+        The commands are queued without blocking, and scheduled by the next :meth:`.run`, right
+        after the button bindings are polled, as if by :meth:`.schedule`. Submissions are kept
+        queued while the scheduler is disabled.
+
+        :param commands: the commands to schedule
+        """
+        now = Timer.getFPGATimestamp()
+        for command in commands:
+            self._submissions.append((True, command, now))
+
+    def cancelFromThread(self, *commands: Command) -> None:
+        """
+        Cancels commands from any thread. The commands are queued without blocking, and canceled
+        by the next :meth:`.run`, in submission order with the commands queued by
+        :meth:`.scheduleFromThread`.
+
+        :param commands: the commands to cancel
+        """
+        now = Timer.getFPGATimestamp()
+        for command in commands:
+            self._submissions.append((False, command, now))
+
+    def _drainSubmissions(self) -> None:
+        submissions = self._submissions
+        now = Timer.getFPGATimestamp()
+        latency = 0.0
+        # Only apply what was queued so far, so busy producers cannot stall the loop.
+        for _ in range(len(submissions)):
+            schedule, command, submitted = submissions.popleft()
+            latency = max(latency, now - submitted)
+            if schedule:
+                self.schedule(command)
+            else:
+                self.cancel(command)
+        self._submissionLatency = latency
+        self._maxSubmissionLatency = max(self._maxSubmissionLatency, latency)
+
+    def getSubmissionQueueDepth(self) -> int:
+        """
+        Returns the number of commands submitted from other threads that are waiting for the next
+        :meth:`.run`.
+
+        :returns: the number of queued submissions
+        """
+        return len(self._submissions)
+
+    def getSubmissionLatency(self) -> float:
+        """
+        Returns how long the oldest submission applied by the last :meth:`.run` that applied any
+        waited in the queue.
+
+        :returns: the latency, in seconds
+        """
+        return self._submissionLatency
+
+    def getMaxSubmissionLatency(self) -> float:
+        """
+        Returns the longest time that a submission from another thread waited in the queue.
+
+        :returns: the latency, in seconds
+        """
+        return self._maxSubmissionLatency
 
     def isScheduled(self, *commands: Command) -> bool:
         """
@@ -462,6 +1094,12 @@ class CommandScheduler(Sendable):
         :param commands: the command to query
         :returns: whether the command is currently scheduled
         """
+        if CommandScheduler._subsystemOwners:
+            for command in commands:
+                scheduler = self._schedulerFor(command)
+                if scheduler is None or command not in scheduler._scheduledCommands:
+                    return False
+            return True
         return all(command in self._scheduledCommands for command in commands)
 
     def requiring(self, subsystem: Subsystem) -> Optional[Command]:
@@ -473,6 +1111,10 @@ class CommandScheduler(Sendable):
         :returns: the command currently requiring the subsystem, or None if no command is currently
             scheduled
         """
+        owner = self._owner(subsystem)
+        if owner is not self:
+            return owner.requiring(subsystem)
+
         return self._requirements.get(subsystem)
 
     def disable(self) -> None:
@@ -483,60 +1125,211 @@ class CommandScheduler(Sendable):
         """Enables the command scheduler."""
         self._disabled = False
 
+    def setTrace(self, trace: Optional[SchedulerTrace]) -> None:
+        """
+        Records the lifecycle events of the commands run by this scheduler to a trace, or stops
+        recording them. The previous trace, if any, is flushed.
+
+        :param trace: the trace to record to, or None to stop tracing
+        """
+        if self._trace is not None:
+            self._trace.flush()
+        self._trace = trace
+
+    def getTrace(self) -> Optional[SchedulerTrace]:
+        """
+        Gets the trace that the scheduler records to.
+
+        :returns: the trace, or None if the scheduler is not tracing
+        """
+        return self._trace
+
     def printWatchdogEpochs(self) -> None:
         """
         Prints list of epochs added so far and their times.
         """
         self._watchdog.printEpochs()
 
-    def onCommandInitialize(self, action: Callable[[Command], Any]) -> None:
+    def _commandFilter(
+        self,
+        command: Optional[Command],
+        commandType: Optional[Type[Command]],
+        subsystem: Optional[Subsystem],
+        name: Optional[str],
+    ) -> _CommandFilter:
+        """Creates the filter of an action from its keyword arguments."""
+        if (
+            command is None
+            and commandType is None
+            and subsystem is None
+            and name is None
+        ):
+            return None
+
+        pattern = re.compile(name) if name is not None else None
+
+        def matches(cmd: Command, requirements: Iterable[Subsystem]) -> bool:
+            return (
+                (command is None or cmd is command)
+                and (commandType is None or isinstance(cmd, commandType))
+                and (subsystem is None or subsystem in requirements)
+                and (pattern is None or pattern.search(cmd.getName()) is not None)
+            )
+
+        return matches
+
+    def _subscribe(
+        self, event: str, action: Callable[..., Any], commandFilter: _CommandFilter
+    ) -> None:
+        assert callable(action)
+        self._subscriptions.append((event, action, commandFilter))
+        if commandFilter is None:
+            self._allCommandListeners.add(event, action)
+        else:
+            self._filteredSubscriptions = True
+
+        # Commands that are already running pick up the new action
+        for command, requirements in self._scheduledCommands.items():
+            self._commandListeners[command] = self._resolveListeners(
+                command, requirements
+            )
+
+    def _resolveListeners(
+        self, command: Command, requirements: Iterable[Subsystem]
+    ) -> _CommandListeners:
+        """Collects the actions that apply to a command, in the order they were added."""
+        if not self._filteredSubscriptions:
+            return self._allCommandListeners
+
+        listeners = _CommandListeners()
+        for event, action, commandFilter in self._subscriptions:
+            if commandFilter is None or commandFilter(command, requirements):
+                listeners.add(event, action)
+        return listeners
+
+    def onCommandInitialize(
+        self,
+        action: Callable[[Command], Any],
+        *,
+        command: Optional[Command] = None,
+        commandType: Optional[Type[Command]] = None,
+        subsystem: Optional[Subsystem] = None,
+        name: Optional[str] = None,
+    ) -> None:
         """
         Adds an action to perform on the initialization of any command by the scheduler.
 
+        The action can be limited to some commands with the keyword arguments; it then applies
+        to the commands that match all of the given filters. The filters are evaluated once, when
+        a command is scheduled.
+
+        :param action:      the action to perform
+        :param command:     only perform the action for this command
+        :param commandType: only perform the action for commands of this type
+        :param subsystem:   only perform the action for commands that require this subsystem
+        :param name:        only perform the action for commands whose name matches this
+                            regular expression
+        """
+        self._subscribe(
+            "initialize",
+            action,
+            self._commandFilter(command, commandType, subsystem, name),
+        )
+
+    def onCommandExecute(
+        self,
+        action: Callable[[Command], Any],
+        *,
+        command: Optional[Command] = None,
+        commandType: Optional[Type[Command]] = None,
+        subsystem: Optional[Subsystem] = None,
+        name: Optional[str] = None,
+    ) -> None:
+        """
+        Adds an action to perform on the execution of any command by the scheduler. The action
+        can be limited to some commands, see :meth:`.onCommandInitialize`.
+
         :param action: the action to perform
         """
-        assert callable(action)
-        self._initActions.append(action)
+        self._subscribe(
+            "execute",
+            action,
+            self._commandFilter(command, commandType, subsystem, name),
+        )
 
-    def onCommandExecute(self, action: Callable[[Command], Any]) -> None:
+    def onCommandsExecuted(self, action: Callable[[List[Command]], Any]) -> None:
         """
-        Adds an action to perform on the execution of any command by the scheduler.
+        Adds an action to perform once per run of the scheduler, after the scheduled commands
+        have been executed. The action receives the commands that were executed on that run, in
+        the order they were executed.
 
         :param action: the action to perform
         """
         assert callable(action)
-        self._executeActions.append(action)
+        self._executedActions.append(action)
 
-    def onCommandInterrupt(self, action: Callable[[Command], Any]) -> None:
+    def onCommandInterrupt(
+        self,
+        action: Callable[[Command], Any],
+        *,
+        command: Optional[Command] = None,
+        commandType: Optional[Type[Command]] = None,
+        subsystem: Optional[Subsystem] = None,
+        name: Optional[str] = None,
+    ) -> None:
         """
-        Adds an action to perform on the interruption of any command by the scheduler.
+        Adds an action to perform on the interruption of any command by the scheduler. The action
+        can be limited to some commands, see :meth:`.onCommandInitialize`.
 
         :param action: the action to perform
         """
-
-        assert callable(action)
-        self._interruptActions.append(lambda command, interruptor: action(command))
+        self._subscribe(
+            "interrupt",
+            action,
+            self._commandFilter(command, commandType, subsystem, name),
+        )
 
     def onCommandInterruptWithCause(
-        self, action: Callable[[Command, Optional[Command]], Any]
+        self,
+        action: Callable[[Command, Optional[Command]], Any],
+        *,
+        command: Optional[Command] = None,
+        commandType: Optional[Type[Command]] = None,
+        subsystem: Optional[Subsystem] = None,
+        name: Optional[str] = None,
     ) -> None:
         """
-        Adds an action to perform on the interruption of any command by the scheduler. The action receives the interrupted command and the command that interrupted it
+        Adds an action to perform on the interruption of any command by the scheduler. The action receives the interrupted command and the command that interrupted it.
+        The action can be limited to some commands, see :meth:`.onCommandInitialize`.
 
         :param action: the action to perform
         """
+        self._subscribe(
+            "interruptWithCause",
+            action,
+            self._commandFilter(command, commandType, subsystem, name),
+        )
 
-        assert callable(action)
-        self._interruptActions.append(action)
-
-    def onCommandFinish(self, action: Callable[[Command], Any]) -> None:
+    def onCommandFinish(
+        self,
+        action: Callable[[Command], Any],
+        *,
+        command: Optional[Command] = None,
+        commandType: Optional[Type[Command]] = None,
+        subsystem: Optional[Subsystem] = None,
+        name: Optional[str] = None,
+    ) -> None:
         """
-        Adds an action to perform on the finishing of any command by the scheduler.
+        Adds an action to perform on the finishing of any command by the scheduler. The action
+        can be limited to some commands, see :meth:`.onCommandInitialize`.
 
         :param action: the action to perform
         """
-        assert callable(action)
-        self._finishActions.append(action)
+        self._subscribe(
+            "finish",
+            action,
+            self._commandFilter(command, commandType, subsystem, name),
+        )
 
     def registerComposedCommands(self, commands: Iterable[Command]) -> None:
         """
@@ -634,19 +1427,34 @@ class CommandScheduler(Sendable):
 
     def initSendable(self, builder: SendableBuilder):
         builder.setSmartDashboardType("Scheduler")
+
+        # The properties are read on every dashboard update, but the scheduled commands
+        # rarely change between two updates: only rebuild them when they do.
+        cache = SimpleNamespace(version=-1, names=[], ids=[], commands={})
+
+        def refresh() -> SimpleNamespace:
+            if cache.version != self._scheduledVersion:
+                cache.version = self._scheduledVersion
+                cache.commands = {
+                    id(command): command for command in self._scheduledCommands
+                }
+                cache.ids = list(cache.commands)
+                cache.names = [command.getName() for command in cache.commands.values()]
+            return cache
+
         builder.addStringArrayProperty(
             "Names",
-            lambda: [command.getName() for command in self._scheduledCommands],
+            lambda: refresh().names,
             lambda _: None,
         )
         builder.addIntegerArrayProperty(
             "Ids",
-            lambda: [id(command) for command in self._scheduledCommands],
+            lambda: refresh().ids,
             lambda _: None,
         )
 
         def cancel_commands(to_cancel: List[int]):
-            ids = {id(command): command for command in self._scheduledCommands}
+            ids = refresh().commands
             for hash_value in to_cancel:
                 cancelCmd = ids.get(hash_value)
                 if cancelCmd is not None:
@@ -6,6 +6,7 @@ from typing import Dict
 from .command import Command, InterruptionBehavior
 from .commandscheduler import CommandScheduler
 from .exceptions import IllegalCommandUse
+from .schedulertrace import SchedulerTrace, TraceEvent
 from .util import flatten_args_commands
 
 
@@ -69,10 +70,15 @@ class ParallelCommandGroup(Command):
             self._commands[command] = True
 
     def execute(self):
+        trace = SchedulerTrace.current
         for command, isRunning in self._commands.items():
             if not isRunning:
                 continue
+            if trace is not None:
+                trace.record(TraceEvent.kExecuteStart, command, self)
             command.execute()
+            if trace is not None:
+                trace.record(TraceEvent.kExecuteEnd, command, self)
             if command.isFinished():
                 command.end(False)
                 self._commands[command] = False
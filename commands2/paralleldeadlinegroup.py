@@ -8,6 +8,7 @@ from wpiutil import SendableBuilder
 from .command import Command, InterruptionBehavior
 from .commandscheduler import CommandScheduler
 from .exceptions import IllegalCommandUse
+from .schedulertrace import SchedulerTrace, TraceEvent
 from .util import flatten_args_commands
 
 
@@ -106,10 +107,15 @@ class ParallelDeadlineGroup(Command):
         self._finished = False
 
     def execute(self):
+        trace = SchedulerTrace.current
         for command, isRunning in self._commands.items():
             if not isRunning:
                 continue
+            if trace is not None:
+                trace.record(TraceEvent.kExecuteStart, command, self)
             command.execute()
+            if trace is not None:
+                trace.record(TraceEvent.kExecuteEnd, command, self)
             if command.isFinished():
                 command.end(False)
                 self._commands[command] = False
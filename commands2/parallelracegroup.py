@@ -1,11 +1,12 @@
 # validated: 2024-01-19 DS aaea85ff1656 ParallelRaceGroup.java
 from __future__ import annotations
 
-from typing import Set
+from typing import Dict
 
 from .command import Command, InterruptionBehavior
 from .commandscheduler import CommandScheduler
 from .exceptions import IllegalCommandUse
+from .schedulertrace import SchedulerTrace, TraceEvent
 from .util import flatten_args_commands
 
 
@@ -17,6 +18,10 @@ class ParallelRaceGroup(Command):
     The rules for command compositions apply: command instances that are passed to it cannot be
     added to any other composition or scheduled individually, and the composition requires all
     subsystems its components require.
+
+    Commands are executed in the order they were added, and the commands after the first
+    one to finish are not executed on that iteration. Whether each command finished is recorded
+    once per iteration and reused when the group ends.
     """
 
     def __init__(self, *commands: Command):
@@ -28,7 +33,8 @@ class ParallelRaceGroup(Command):
         :param commands: the commands to include in this composition.
         """
         super().__init__()
-        self._commands: Set[Command] = set()
+        # A map from the commands in the group to whether they have finished.
+        self._commands: Dict[Command, bool] = {}
         self._runsWhenDisabled = True
         self._finished = True
         self._interruptBehavior = InterruptionBehavior.kCancelIncoming
@@ -56,7 +62,7 @@ class ParallelRaceGroup(Command):
                     common=in_common,
                 )
 
-            self._commands.add(command)
+            self._commands[command] = False
             self.requirements.update(command.getRequirements())
             self._runsWhenDisabled = (
                 self._runsWhenDisabled and command.runsWhenDisabled()
@@ -68,17 +74,25 @@ class ParallelRaceGroup(Command):
     def initialize(self):
         self._finished = False
         for command in self._commands:
+            self._commands[command] = False
             command.initialize()
 
     def execute(self):
+        trace = SchedulerTrace.current
         for command in self._commands:
+            if trace is not None:
+                trace.record(TraceEvent.kExecuteStart, command, self)
             command.execute()
+            if trace is not None:
+                trace.record(TraceEvent.kExecuteEnd, command, self)
             if command.isFinished():
+                self._commands[command] = True
                 self._finished = True
+                break
 
     def end(self, interrupted: bool):
-        for command in self._commands:
-            command.end(not command.isFinished())
+        for command, finished in self._commands.items():
+            command.end(not finished)
 
     def isFinished(self) -> bool:
         return self._finished
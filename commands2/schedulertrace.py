@@ -0,0 +1,267 @@
+# notrack
+from __future__ import annotations
+
+import sys
+from array import array
+from enum import IntEnum
+from typing import ClassVar, Dict, Iterator, List, Optional, Tuple, Union
+
+from wpilib import DataLogManager, RobotController
+from wpiutil.log import DataLog, DataLogReader, RawLogEntry, StringLogEntry
+
+from .command import Command
+from .subsystem import Subsystem
+
+# The columns of a record: FPGA timestamps in microseconds, event types, command ids and
+# other ids, each stored contiguously
+_columns = ("q", "B", "i", "i")
+_eventSize = sum(array(typecode).itemsize for typecode in _columns)
+
+kTraceType = "commands2.trace"
+"""The type of the raw DataLog entry that trace events are written to."""
+
+
+class TraceEvent(IntEnum):
+    """The types of the events recorded by a :class:`SchedulerTrace`."""
+
+    kSchedule = 0
+    """A command was accepted by the scheduler. The other id is unused."""
+
+    kInitialize = 1
+    """A command was initialized. The other id is unused."""
+
+    kFinish = 2
+    """A command finished. The other id is unused."""
+
+    kInterrupt = 3
+    """A command was interrupted. The other id is the interrupting command, if any."""
+
+    kRequirement = 4
+    """A command took a subsystem from the command it interrupted. The other id is the subsystem."""
+
+    kTickStart = 5
+    """A :meth:`.CommandScheduler.run` call started. Both ids are unused."""
+
+    kTickEnd = 6
+    """A :meth:`.CommandScheduler.run` call ended. Both ids are unused."""
+
+    kPeriodicStart = 7
+    """The periodic methods of a subsystem started. The other id is the subsystem."""
+
+    kPeriodicEnd = 8
+    """The periodic methods of a subsystem ended. The other id is the subsystem."""
+
+    kPollStart = 9
+    """The button loop poll started. Both ids are unused."""
+
+    kPollEnd = 10
+    """The button loop poll ended. Both ids are unused."""
+
+    kExecuteStart = 11
+    """
+    A command's execute method started. The other id is the composition that executed it, or
+    unused if it was executed by the scheduler.
+    """
+
+    kExecuteEnd = 12
+    """
+    A command's execute method ended. The other id is the composition that executed it, or
+    unused if it was executed by the scheduler.
+    """
+
+
+class SchedulerTrace:
+    """
+    Records the lifecycle events of the commands run by a :class:`.CommandScheduler` into a
+    :class:`wpiutil.log.DataLog`, for reconstructing what happened during a match. Enable it with
+    :meth:`.CommandScheduler.setTrace`.
+
+    Events are stored as integers in preallocated arrays, and written to the log in bulk when the
+    buffer is full or when the flush period has passed. Commands and subsystems are given an id the
+    first time they appear in the trace; their names are written once, to a string entry.
+
+    The events entry holds raw records of ``n`` events each, stored as little-endian columns:
+    ``n`` int64 timestamps in microseconds, then ``n`` uint8 event types, ``n`` int32 command ids
+    and ``n`` int32 other ids. Unused ids are -1. The names entry holds
+    ``"<id>\\t<command|subsystem>\\t<name>"`` strings. Use :func:`readTrace` to decode them, or
+    :mod:`commands2.chrometrace` to view them as a timeline.
+
+    With ``profile`` enabled, every scheduler tick is also recorded as nested start and end events:
+    the tick itself, each subsystem's periodic methods, the button loop poll and each command's
+    execute method, including the children executed by command groups. This roughly doubles the
+    cost of a tick, so it is meant for profiling sessions rather than matches.
+    """
+
+    current: ClassVar[Optional[SchedulerTrace]] = None
+    """
+    The trace of the scheduler whose commands are being executed, if it has one and it is
+    profiling. Command groups use it to record the execution of their children.
+    """
+
+    def __init__(
+        self,
+        log: Optional[DataLog] = None,
+        name: str = "scheduler",
+        capacity: int = 4096,
+        flushPeriod: float = 1.0,
+        profile: bool = False,
+    ):
+        """
+        :param log:         The log to write to. Defaults to the :class:`wpilib.DataLogManager` log.
+        :param name:        The prefix of the log entries.
+        :param capacity:    The number of events to buffer before they are written to the log.
+        :param flushPeriod: The maximum time to keep events buffered, in seconds.
+        :param profile:     Whether to also record the ticks, periodic methods, button polls and
+                            command executions as nested slices.
+        """
+        assert capacity > 0
+        if log is None:
+            log = DataLogManager.getLog()
+
+        self.profile = profile
+
+        self._events = RawLogEntry(
+            log, f"{name}/events", "columns:" + "".join(_columns), kTraceType
+        )
+        self._names = StringLogEntry(log, f"{name}/names")
+
+        self._capacity = capacity
+        self._size = 0
+        self._times = array("q", bytes(8 * capacity))
+        self._types = array("B", bytes(capacity))
+        self._commands = array("i", bytes(4 * capacity))
+        self._others = array("i", bytes(4 * capacity))
+
+        self._flushPeriod = int(flushPeriod * 1e6)
+        self._lastFlush = RobotController.getFPGATime()
+
+        self._ids: Dict[Union[Command, Subsystem], int] = {}
+
+    def getId(self, target: Union[Command, Subsystem]) -> int:
+        """
+        Returns the trace id of a command or subsystem, assigning one if it has none yet.
+
+        :param target: the command or subsystem
+        :returns: its id in the trace
+        """
+        traceId = self._ids.get(target)
+        if traceId is None:
+            traceId = len(self._ids)
+            self._ids[target] = traceId
+            kind = "command" if isinstance(target, Command) else "subsystem"
+            self._names.append(f"{traceId}\t{kind}\t{target.getName()}")
+        return traceId
+
+    def record(
+        self,
+        event: TraceEvent,
+        command: Optional[Command] = None,
+        other: Union[Command, Subsystem, None] = None,
+    ) -> None:
+        """
+        Records an event. Writes the buffered events to the log first if the buffer is full.
+
+        :param event:   the type of the event
+        :param command: the command the event is about
+        :param other:   the other command or subsystem of the event
+        """
+        if self._size == self._capacity:
+            self.flush()
+
+        i = self._size
+        self._times[i] = RobotController.getFPGATime()
+        self._types[i] = event
+        self._commands[i] = -1 if command is None else self.getId(command)
+        self._others[i] = -1 if other is None else self.getId(other)
+        self._size = i + 1
+
+    def tick(self) -> None:
+        """Writes the buffered events to the log if the flush period has passed."""
+        if RobotController.getFPGATime() - self._lastFlush >= self._flushPeriod:
+            self.flush()
+
+    def size(self) -> int:
+        """Returns the number of events currently buffered."""
+        return self._size
+
+    def flush(self) -> None:
+        """Writes all of the buffered events to the log and empties the buffer."""
+        now = RobotController.getFPGATime()
+        self._lastFlush = now
+        if self._size == 0:
+            return
+
+        size = self._size
+        columns = [
+            column[:size]
+            for column in (self._times, self._types, self._commands, self._others)
+        ]
+        if sys.byteorder == "big":
+            for column in columns:
+                column.byteswap()
+        self._events.append(b"".join(columns), now)
+        self._size = 0
+
+
+def decodeTraceEvents(data: bytes) -> Iterator[Tuple[int, TraceEvent, int, int]]:
+    """
+    Decodes a raw record of a :class:`SchedulerTrace` events entry.
+
+    :param data: the contents of the record
+    :returns: the ``(timestamp, event, command id, other id)`` of each event
+    """
+    count = len(data) // _eventSize
+    columns = []
+    offset = 0
+    for typecode in _columns:
+        column = array(typecode)
+        end = offset + column.itemsize * count
+        column.frombytes(data[offset:end])
+        if sys.byteorder == "big":
+            column.byteswap()
+        columns.append(column)
+        offset = end
+
+    times, events, commands, others = columns
+    for timestamp, event, command, other in zip(times, events, commands, others):
+        yield timestamp, TraceEvent(event), command, other
+
+
+def readTrace(
+    filename: str, name: str = "scheduler"
+) -> Tuple[Dict[int, Tuple[str, str]], List[Tuple[int, TraceEvent, int, int]]]:
+    """
+    Reads a :class:`SchedulerTrace` from a WPILog file.
+
+    :param filename: the log file
+    :param name:     the prefix of the trace entries
+    :returns: a map from the ids to the kind (``"command"`` or ``"subsystem"``) and name of each
+              command and subsystem, and the ``(timestamp, event, command id, other id)`` of each
+              event, in time order
+    """
+    reader = DataLogReader(filename)
+    if not reader.isValid():
+        raise ValueError(f"{filename} is not a valid WPILog file")
+
+    eventsEntry = -1
+    namesEntry = -1
+    names: Dict[int, Tuple[str, str]] = {}
+    events: List[Tuple[int, TraceEvent, int, int]] = []
+
+    for record in reader:
+        if record.isStart():
+            start = record.getStartData()
+            if start.name == f"{name}/events" and start.type == kTraceType:
+                eventsEntry = start.entry
+            elif start.name == f"{name}/names":
+                namesEntry = start.entry
+        elif record.isControl():
+            continue
+        elif record.getEntry() == eventsEntry:
+            events.extend(decodeTraceEvents(bytes(record.getRaw())))
+        elif record.getEntry() == namesEntry:
+            traceId, kind, targetName = record.getString().split("\t", 2)
+            names[int(traceId)] = (kind, targetName)
+
+    events.sort(key=lambda event: event[0])
+    return names, events
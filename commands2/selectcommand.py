@@ -1,13 +1,17 @@
 # validated: 2024-01-19 DS a4a8ad9c753e SelectCommand.java
 from __future__ import annotations
 
-from typing import Callable, Dict, Hashable
+from typing import Callable, Dict, Hashable, Optional, Set, Tuple
 
 from wpiutil import SendableBuilder
 
 from .command import Command, InterruptionBehavior
 from .commandscheduler import CommandScheduler
 from .printcommand import PrintCommand
+from .subsystem import Subsystem
+
+# requirements, runsWhenDisabled, interruption behavior
+_SelectionInfo = Tuple[Set[Subsystem], bool, InterruptionBehavior]
 
 
 class SelectCommand(Command):
@@ -18,18 +22,29 @@ class SelectCommand(Command):
     The rules for command compositions apply: command instances that are passed to it cannot be
     added to any other composition or scheduled individually, and the composition requires all
     subsystems its components require.
+
+    If ``selectedRequirements`` is enabled, the requirements, interruption behavior and
+    disabled behavior of each option are precomputed, and the selector is evaluated when
+    the command is scheduled. While it is scheduled and running, the command only requires
+    the subsystems of the selected option, so scheduling it does not interrupt commands
+    (such as default commands) on subsystems that only the other options use. Otherwise,
+    and inside another composition, the command requires the subsystems of all of its
+    options.
     """
 
     def __init__(
         self,
         commands: Dict[Hashable, Command],
         selector: Callable[[], Hashable],
+        selectedRequirements: bool = False,
     ):
         """
         Creates a new SelectCommand.
 
         :param commands: the map of commands to choose from
         :param selector: the selector to determine which command to run
+        :param selectedRequirements: whether to only require the subsystems of the selected
+                                     command when scheduled directly
         """
         super().__init__()
 
@@ -42,7 +57,7 @@ class SelectCommand(Command):
         self._commands = commands
         self._selector = selector
         # This is slightly different than Java but avoids UB
-        self._selectedCommand = self._defaultCommand
+        self._selectedCommand: Command = self._defaultCommand
         self._runsWhenDisabled = True
         self._interruptBehavior = InterruptionBehavior.kCancelIncoming
 
@@ -58,25 +73,76 @@ class SelectCommand(Command):
             if command.getInterruptionBehavior() == InterruptionBehavior.kCancelSelf:
                 self._interruptBehavior = InterruptionBehavior.kCancelSelf
 
-    def initialize(self):
-        self._selectedCommand = self._commands.get(
-            self._selector(), self._defaultCommand
+        self._selectedRequirements = selectedRequirements
+        self._selectionInfo: Dict[Command, _SelectionInfo] = {}
+        # The command chosen by the selector while this command is being scheduled
+        self._pendingCommand: Optional[Command] = None
+        self._running = False
+
+        if selectedRequirements:
+            for command in (self._defaultCommand, *commands.values()):
+                self._selectionInfo[command] = (
+                    set(command.getRequirements()),
+                    command.runsWhenDisabled(),
+                    command.getInterruptionBehavior(),
+                )
+
+    def _usesSelectedRequirements(self) -> bool:
+        return (
+            self._selectedRequirements
+            and not CommandScheduler.getInstance().isComposed(self)
         )
+
+    def _currentInfo(self) -> _SelectionInfo:
+        if self._running:
+            return self._selectionInfo[self._selectedCommand]
+        if self._pendingCommand is not None:
+            return self._selectionInfo[self._pendingCommand]
+        return self.requirements, self._runsWhenDisabled, self._interruptBehavior
+
+    def initialize(self):
+        if self._pendingCommand is not None:
+            self._selectedCommand = self._pendingCommand
+            self._pendingCommand = None
+        else:
+            self._selectedCommand = self._commands.get(
+                self._selector(), self._defaultCommand
+            )
+        self._running = True
         self._selectedCommand.initialize()
 
     def execute(self):
         self._selectedCommand.execute()
 
     def end(self, interrupted: bool):
+        self._running = False
         self._selectedCommand.end(interrupted)
 
     def isFinished(self) -> bool:
         return self._selectedCommand.isFinished()
 
+    def _prepareToSchedule(self) -> None:
+        if not self._running and self._usesSelectedRequirements():
+            self._pendingCommand = self._commands.get(
+                self._selector(), self._defaultCommand
+            )
+
+    def _finishScheduling(self) -> None:
+        self._pendingCommand = None
+
+    def getRequirements(self) -> Set[Subsystem]:
+        if not self._usesSelectedRequirements():
+            return self.requirements
+        return self._currentInfo()[0]
+
     def runsWhenDisabled(self) -> bool:
+        if self._usesSelectedRequirements():
+            return self._currentInfo()[1]
         return self._runsWhenDisabled
 
     def getInterruptionBehavior(self) -> InterruptionBehavior:
+        if self._usesSelectedRequirements():
+            return self._currentInfo()[2]
         return self._interruptBehavior
 
     def initSendable(self, builder: SendableBuilder) -> None:
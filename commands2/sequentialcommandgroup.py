@@ -8,6 +8,7 @@ from wpiutil import SendableBuilder
 from .command import Command, InterruptionBehavior
 from .commandscheduler import CommandScheduler
 from .exceptions import IllegalCommandUse
+from .schedulertrace import SchedulerTrace, TraceEvent
 from .util import flatten_args_commands
 
 
@@ -68,7 +69,12 @@ class SequentialCommandGroup(Command):
 
         currentCommand = self._commands[self._currentCommandIndex]
 
+        trace = SchedulerTrace.current
+        if trace is not None:
+            trace.record(TraceEvent.kExecuteStart, currentCommand, self)
         currentCommand.execute()
+        if trace is not None:
+            trace.record(TraceEvent.kExecuteEnd, currentCommand, self)
         if currentCommand.isFinished():
             currentCommand.end(False)
             self._currentCommandIndex += 1
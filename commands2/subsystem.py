@@ -99,6 +99,30 @@ class Subsystem(Sendable):
 
         return CommandScheduler.getInstance().requiring(self)
 
+    def setPeriodicRate(self, hz: float, phase: Optional[int] = None) -> None:
+        """
+        Runs this subsystem's :func:`.periodic` and :func:`.simulationPeriodic` methods at a lower
+        rate than the scheduler. See :func:`commands2.CommandScheduler.setRate`.
+
+        :param hz:    the rate to run the periodic methods at, in Hz
+        :param phase: the tick offset to run on; by default, the least loaded offset is picked
+        """
+        from .commandscheduler import CommandScheduler
+
+        CommandScheduler.getInstance().setRate(self, hz, phase)
+
+    def setPriority(self, priority: int) -> None:
+        """
+        Sets the priority of this subsystem's periodic methods. Low-priority work can be deferred
+        when the scheduler runs out of budget. See
+        :func:`commands2.CommandScheduler.setDeferralThreshold`.
+
+        :param priority: the priority; higher values are more important
+        """
+        from .commandscheduler import CommandScheduler
+
+        CommandScheduler.getInstance().setPriority(self, priority)
+
     def register(self):
         """
         Registers this subsystem with the :class:`.CommandScheduler`, allowing its
@@ -3,13 +3,15 @@
 # Open Source Software; you can modify and/or share it under the terms of
 # the WPILib BSD license file in the root directory of this project.
 from __future__ import annotations
-from typing import Callable, Optional, Union, Tuple, Sequence
+import math
+from typing import Callable, List, Optional, Union, Tuple, Sequence
 
 from wpimath.controller import (
     HolonomicDriveController,
 )
 from wpimath.geometry import Pose2d, Rotation2d
 from wpimath.kinematics import (
+    ChassisSpeeds,
     SwerveDrive2Kinematics,
     SwerveDrive3Kinematics,
     SwerveDrive4Kinematics,
@@ -20,6 +22,7 @@ from wpimath.trajectory import Trajectory
 from wpilib import Timer
 
 from .command import Command
+from .exceptions import IllegalCommandUse
 from .subsystem import Subsystem
 
 
@@ -35,6 +38,12 @@ class SwerveControllerCommand(Command):
 
     The robot angle controller does not follow the angle given by the trajectory but rather goes
     to the angle given in the final state of the trajectory.
+
+    If a ``samplePeriod`` is given, the trajectory is sampled once at that period when the
+    command is constructed, and each iteration uses the nearest sample instead of calling
+    :meth:`wpimath.trajectory.Trajectory.sample`. This is meant for a sample period equal to
+    the scheduler period: the command then runs close to the sample times, and the desired
+    state is off by at most half of the sample period when the loop timing jitters.
     """
 
     def __init__(
@@ -51,6 +60,7 @@ class SwerveControllerCommand(Command):
         outputModuleStates: Callable[[Sequence[SwerveModuleState]], None],
         requirements: Tuple[Subsystem],
         desiredRotation: Optional[Callable[[], Rotation2d]] = None,
+        samplePeriod: Optional[float] = None,
     ) -> None:
         """
         Constructs a new SwerveControllerCommand that when executed will follow the
@@ -75,6 +85,8 @@ class SwerveControllerCommand(Command):
         :param desiredRotation:    (optional) The angle that the drivetrain should be
                                    facing. This is sampled at each time step. If not specified, that rotation of
                                    the final pose in the trajectory is used.
+        :param samplePeriod:       (optional) If specified, the period in seconds at which the
+                                   trajectory is presampled, normally the scheduler period.
         """
         super().__init__()
         self._trajectory = trajectory
@@ -87,23 +99,98 @@ class SwerveControllerCommand(Command):
         else:
             self._desiredRotation = desiredRotation
 
+        # The trajectory sampled every samplePeriod, if given
+        self._samples: Optional[List[Trajectory.State]] = None
+        self._sampleRate = 0.0
+        if samplePeriod is not None:
+            assert samplePeriod > 0
+            count = int(math.ceil(trajectory.totalTime() / samplePeriod)) + 1
+            self._samples = [trajectory.sample(i * samplePeriod) for i in range(count)]
+            self._sampleRate = 1 / samplePeriod
+
         self._timer = Timer()
         self.addRequirements(*requirements)
 
     def initialize(self):
         self._timer.restart()
 
+    def _calculate(
+        self, controller: HolonomicDriveController, curTime: float, currentPose: Pose2d
+    ) -> ChassisSpeeds:
+        samples = self._samples
+        if samples is None:
+            desiredState = self._trajectory.sample(curTime)
+        else:
+            i = int(curTime * self._sampleRate + 0.5)
+            desiredState = samples[i if i < len(samples) else -1]
+        return controller.calculate(currentPose, desiredState, self._desiredRotation())
+
     def execute(self):
         curTime = self._timer.get()
-        desiredState = self._trajectory.sample(curTime)
 
-        targetChassisSpeeds = self._controller.calculate(
-            self._pose(), desiredState, self._desiredRotation()
-        )
+        targetChassisSpeeds = self._calculate(self._controller, curTime, self._pose())
         targetModuleStates = self._kinematics.toSwerveModuleStates(targetChassisSpeeds)
 
         self._outputModuleStates(targetModuleStates)
 
+    def evaluate(
+        self,
+        timestamps: Sequence[float],
+        x: Sequence[float],
+        y: Sequence[float],
+        heading: Sequence[float],
+    ) -> Tuple[List[ChassisSpeeds], List[Sequence[SwerveModuleState]]]:
+        """
+        Computes the chassis speeds and module states that this command would have output for a
+        recorded run, without scheduling the command. Useful for tuning the controller by replaying
+        logged poses. Any sequence of floats can be passed, including NumPy arrays.
+
+        Each replay uses a fresh controller with the gains of the command's controller, starting
+        from the first logged pose as the command's controller does on its first run, so identical
+        replays give identical results and the command's own controller is left untouched. The
+        fresh controller is stepped once per sample, as it would be when the command runs, and is
+        always enabled. The desired rotation supplier is called once per sample, and
+        ``outputModuleStates`` is not called. The command cannot be evaluated while it is
+        scheduled.
+
+        :param timestamps: The time of each sample in seconds. The first sample is taken to be the
+                           start of the trajectory.
+        :param x:          The measured x position of the robot at each sample, in meters.
+        :param y:          The measured y position of the robot at each sample, in meters.
+        :param heading:    The measured heading of the robot at each sample, in radians.
+
+        :returns: the chassis speeds and the module states for each sample
+        """
+        assert len(timestamps) == len(x) == len(y) == len(heading)
+        if self.isScheduled():
+            raise IllegalCommandUse(
+                "A scheduled SwerveControllerCommand cannot be evaluated", command=self
+            )
+
+        speeds: List[ChassisSpeeds] = []
+        moduleStates: List[Sequence[SwerveModuleState]] = []
+        if len(timestamps) == 0:
+            return speeds, moduleStates
+
+        # python: the controller getters return copies, reset and use them
+        xController = self._controller.getXController()
+        yController = self._controller.getYController()
+        thetaController = self._controller.getThetaController()
+        xController.reset()
+        yController.reset()
+        thetaController.reset(float(heading[0]))
+        controller = HolonomicDriveController(xController, yController, thetaController)
+
+        start = float(timestamps[0])
+        for t, px, py, ph in zip(timestamps, x, y, heading):
+            chassisSpeeds = self._calculate(
+                controller, float(t) - start, Pose2d(float(px), float(py), float(ph))
+            )
+            speeds.append(chassisSpeeds)
+            moduleStates.append(self._kinematics.toSwerveModuleStates(chassisSpeeds))
+
+        return speeds, moduleStates
+
     def end(self, interrupted):
         self._timer.stop()
 
@@ -1,4 +1,5 @@
+from .sysidanalysis import FeedforwardGains
 from .sysidroutine import SysIdRoutine
 
 
-__all__ = ["SysIdRoutine"]
+__all__ = ["FeedforwardGains", "SysIdRoutine"]
@@ -0,0 +1,180 @@
+# notrack
+from __future__ import annotations
+
+import math
+from array import array
+from dataclasses import dataclass
+from enum import Enum
+from typing import List, Sequence
+
+from wpilib.sysid import State
+
+
+class MechanismType(Enum):
+    """The feedforward model to fit to the data of a SysId routine."""
+
+    kSimple = 0
+    """A mechanism not affected by gravity: ``V = kS*sgn(v) + kV*v + kA*a``"""
+
+    kElevator = 1
+    """A mechanism with a constant gravity load: ``V = kG + kS*sgn(v) + kV*v + kA*a``"""
+
+    kArm = 2
+    """
+    A mechanism with a gravity load depending on its angle:
+    ``V = kG*cos(angle) + kS*sgn(v) + kV*v + kA*a``. The position must be the angle from
+    horizontal in rotations.
+    """
+
+
+@dataclass
+class FeedforwardGains:
+    """The result of fitting a feedforward model to SysId data.
+
+    :param kS:       The static gain, in volts.
+    :param kV:       The velocity gain, in volts per unit of velocity.
+    :param kA:       The acceleration gain, in volts per unit of acceleration.
+    :param kG:       The gravity gain, in volts. Zero for simple mechanisms.
+    :param rSquared: The coefficient of determination of the fit.
+    :param samples:  The number of samples used for the fit.
+    """
+
+    kS: float
+    kV: float
+    kA: float
+    kG: float
+    rSquared: float
+    samples: int
+
+
+class SysIdSampleTable:
+    """
+    An in-memory table of SysId samples, stored as one array per column. Samples are appended in
+    time order as the tests run.
+    """
+
+    def __init__(self) -> None:
+        self.states: List[State] = []
+        self.times = array("d")
+        self.voltages = array("d")
+        self.positions = array("d")
+        self.velocities = array("d")
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def append(
+        self,
+        state: State,
+        time: float,
+        voltage: float,
+        position: float,
+        velocity: float,
+    ) -> None:
+        """
+        Appends a sample to the table.
+
+        :param state:    The test that was running.
+        :param time:     The time of the sample, in seconds.
+        :param voltage:  The voltage applied to the motor.
+        :param position: The position of the motor.
+        :param velocity: The velocity of the motor.
+        """
+        self.states.append(state)
+        self.times.append(time)
+        self.voltages.append(voltage)
+        self.positions.append(position)
+        self.velocities.append(velocity)
+
+    def fit(
+        self, mechanismType: MechanismType = MechanismType.kSimple
+    ) -> FeedforwardGains:
+        """
+        Fits a feedforward model to the samples with ordinary least squares. The acceleration of
+        each sample is estimated from the velocities of its neighbours in the same test; samples
+        at the edges of a test, or with zero velocity, are not used.
+
+        :param mechanismType: The feedforward model to fit.
+
+        :returns: The fitted gains.
+
+        :raises ValueError: if there are not enough samples to fit the model.
+        """
+        rows: List[Sequence[float]] = []
+        targets: List[float] = []
+
+        for i in range(1, len(self.times) - 1):
+            state = self.states[i]
+            if (
+                state == State.kNone
+                or self.states[i - 1] != state
+                or self.states[i + 1] != state
+            ):
+                continue
+
+            velocity = self.velocities[i]
+            dt = self.times[i + 1] - self.times[i - 1]
+            if velocity == 0 or dt <= 0 or math.isnan(velocity):
+                continue
+
+            acceleration = (self.velocities[i + 1] - self.velocities[i - 1]) / dt
+            row = [math.copysign(1.0, velocity), velocity, acceleration]
+            if mechanismType == MechanismType.kElevator:
+                row.append(1.0)
+            elif mechanismType == MechanismType.kArm:
+                row.append(math.cos(self.positions[i] * 2 * math.pi))
+
+            rows.append(row)
+            targets.append(self.voltages[i])
+
+        coefficients = _leastSquares(rows, targets)
+
+        mean = sum(targets) / len(targets)
+        totalSquares = sum((y - mean) ** 2 for y in targets)
+        residualSquares = sum(
+            (y - sum(c * x for c, x in zip(coefficients, row))) ** 2
+            for row, y in zip(rows, targets)
+        )
+        rSquared = 1.0 - residualSquares / totalSquares if totalSquares > 0 else 1.0
+
+        return FeedforwardGains(
+            kS=coefficients[0],
+            kV=coefficients[1],
+            kA=coefficients[2],
+            kG=coefficients[3] if len(coefficients) > 3 else 0.0,
+            rSquared=rSquared,
+            samples=len(rows),
+        )
+
+
+def _leastSquares(rows: List[Sequence[float]], targets: List[float]) -> List[float]:
+    """Solves the normal equations of a least squares problem by Gaussian elimination."""
+    if not rows or len(rows) < len(rows[0]):
+        raise ValueError("Not enough SysId samples to fit a feedforward model")
+
+    n = len(rows[0])
+    # Augmented matrix [XᵀX | Xᵀy]
+    matrix = [[0.0] * (n + 1) for _ in range(n)]
+    for row, y in zip(rows, targets):
+        for j in range(n):
+            xj = row[j]
+            matrixRow = matrix[j]
+            for k in range(n):
+                matrixRow[k] += xj * row[k]
+            matrixRow[n] += xj * y
+
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(matrix[r][col]))
+        if abs(matrix[pivot][col]) < 1e-12:
+            raise ValueError(
+                "SysId samples are degenerate, a feedforward model cannot be fit"
+            )
+        matrix[col], matrix[pivot] = matrix[pivot], matrix[col]
+
+        for r in range(n):
+            if r != col:
+                factor = matrix[r][col] / matrix[col][col]
+                for k in range(col, n + 1):
+                    matrix[r][k] -= factor * matrix[col][k]
+
+    return [matrix[i][n] / matrix[i][i] for i in range(n)]
@@ -0,0 +1,180 @@
+# notrack
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Dict, List, Tuple
+
+from wpilib import DataLogManager
+from wpiutil.log import DoubleLogEntry
+
+
+class SysIdMotorLogBuffer:
+    """
+    A handle for buffering the data of a single motor, with the same chainable methods as
+    :class:`wpilib.sysid.SysIdRoutineLog.MotorLog`.
+    """
+
+    def __init__(self, buffer: SysIdLogBuffer, motorName: str):
+        self._buffer = buffer
+        self._motorName = motorName
+
+    def value(self, name: str, value: float, unit: str) -> SysIdMotorLogBuffer:
+        """
+        Records a generic value for this motor.
+
+        :param name:  The name of the value.
+        :param value: The value to record.
+        :param unit:  The unit of the value.
+        """
+        self._buffer.record(self._motorName, name, value, unit)
+        return self
+
+    def voltage(self, volts: float) -> SysIdMotorLogBuffer:
+        """Records the voltage applied to this motor."""
+        return self.value("voltage", volts, "volt")
+
+    def position(self, meters: float) -> SysIdMotorLogBuffer:
+        """Records the linear position of this motor."""
+        return self.value("position", meters, "meter")
+
+    def angularPosition(self, turns: float) -> SysIdMotorLogBuffer:
+        """Records the angular position of this motor."""
+        return self.value("position", turns, "turn")
+
+    def velocity(self, meters_per_second: float) -> SysIdMotorLogBuffer:
+        """Records the linear velocity of this motor."""
+        return self.value("velocity", meters_per_second, "meters_per_second")
+
+    def angularVelocity(self, turns_per_second: float) -> SysIdMotorLogBuffer:
+        """Records the angular velocity of this motor."""
+        return self.value("velocity", turns_per_second, "turns_per_second")
+
+    def acceleration(self, meters_per_second_squared: float) -> SysIdMotorLogBuffer:
+        """Records the linear acceleration of this motor."""
+        return self.value(
+            "acceleration", meters_per_second_squared, "meters_per_second_squared"
+        )
+
+    def angularAcceleration(
+        self, turns_per_second_squared: float
+    ) -> SysIdMotorLogBuffer:
+        """Records the angular acceleration of this motor."""
+        return self.value(
+            "acceleration", turns_per_second_squared, "turns_per_second_squared"
+        )
+
+    def current(self, amps: float) -> SysIdMotorLogBuffer:
+        """Records the current applied to this motor."""
+        return self.value("current", amps, "ampere")
+
+
+class SysIdLogBuffer:
+    """
+    Buffers SysId motor frames in preallocated arrays and writes them to the
+    :class:`wpilib.DataLogManager` log in bulk, under the same entry names as
+    :class:`wpilib.sysid.SysIdRoutineLog`.
+
+    Each frame has a single timestamp, and each value logged by the mechanism is stored in a
+    column for its motor and name. Values that were not logged in a frame are stored as NaN and
+    are not written to the log.
+    """
+
+    def __init__(self, logName: str, capacity: int):
+        """
+        :param logName:  The name of the SysId routine, appended to every entry name.
+        :param capacity: The number of frames to buffer before they are written to the log.
+        """
+        assert capacity > 0
+        self._logName = logName
+        self._capacity = capacity
+        self._size = 0
+        self._timestamps = array("q", bytes(8 * capacity))
+        self._columns: Dict[Tuple[str, str], array] = {}
+        self._units: Dict[Tuple[str, str], str] = {}
+        self._entries: Dict[Tuple[str, str], DoubleLogEntry] = {}
+        self._motors: Dict[str, SysIdMotorLogBuffer] = {}
+
+    def motor(self, motorName: str) -> SysIdMotorLogBuffer:
+        """
+        Returns a handle for logging the data of a motor in the current frame.
+
+        :param motorName: The name of the motor.
+        """
+        motorLog = self._motors.get(motorName)
+        if motorLog is None:
+            motorLog = SysIdMotorLogBuffer(self, motorName)
+            self._motors[motorName] = motorLog
+        return motorLog
+
+    def beginFrame(self, timestamp: int) -> None:
+        """
+        Starts a new frame. Writes the buffered frames to the log first if the buffer is full.
+
+        :param timestamp: The timestamp of the frame, in microseconds.
+        """
+        if self._size == self._capacity:
+            self.flush()
+        self._timestamps[self._size] = timestamp
+        self._size += 1
+
+    def record(self, motorName: str, name: str, value: float, unit: str) -> None:
+        """Stores a value in the current frame."""
+        key = (motorName, name)
+        column = self._columns.get(key)
+        if column is None:
+            column = array("d", [math.nan]) * self._capacity
+            self._columns[key] = column
+            self._units[key] = unit
+        column[self._size - 1] = value
+
+    def size(self) -> int:
+        """Returns the number of frames currently buffered."""
+        return self._size
+
+    def motorNames(self) -> List[str]:
+        """Returns the names of the motors logged so far, in the order they were first logged."""
+        return list(self._motors)
+
+    def current(self, motorName: str, name: str) -> float:
+        """
+        Returns a value of a motor in the current frame, or NaN if it was not logged.
+
+        :param motorName: The name of the motor.
+        :param name:      The name of the value.
+        """
+        column = self._columns.get((motorName, name))
+        if column is None or self._size == 0:
+            return math.nan
+        return column[self._size - 1]
+
+    def column(self, motorName: str, name: str) -> array:
+        """
+        Returns the buffered values of a motor, one per frame. Only the first :meth:`size`
+        values are valid.
+        """
+        return self._columns[(motorName, name)]
+
+    def flush(self) -> None:
+        """Writes all of the buffered frames to the log and empties the buffer."""
+        if self._size == 0:
+            return
+
+        log = DataLogManager.getLog()
+        timestamps = self._timestamps
+        for key, column in self._columns.items():
+            entry = self._entries.get(key)
+            if entry is None:
+                motorName, name = key
+                entry = DoubleLogEntry(
+                    log, f"{name}-{motorName}-{self._logName}", self._units[key]
+                )
+                self._entries[key] = entry
+
+            for i in range(self._size):
+                value = column[i]
+                if not math.isnan(value):
+                    entry.append(value, timestamps[i])
+                    column[i] = math.nan
+
+        self._size = 0
@@ -1,11 +1,22 @@
 # validated: 2024-02-20 DV ee15cc172a5e sysid/SysIdRoutine.java
+import math
+import threading
 from dataclasses import dataclass, field
 from enum import Enum
 
+from ntcore import NetworkTable, NetworkTableInstance
 from wpilib.sysid import SysIdRoutineLog, State
 from ..command import Command
 from ..subsystem import Subsystem
-from wpilib import Timer
+from ..waitcommand import WaitCommand
+from .sysidanalysis import (
+    FeedforwardGains,
+    MechanismType,
+    MechanismType as _MechanismType,
+    SysIdSampleTable,
+)
+from .sysidlogbuffer import SysIdLogBuffer
+from wpilib import Notifier, RobotController, Timer, reportError
 
 from wpimath.units import seconds, volts
 
@@ -32,8 +43,22 @@ class SysIdRoutine(SysIdRoutineLog):
     then extracts the motor frames within the valid timestamp ranges. If a given test was run
     multiple times in a single logfile, the user will need to select which of the tests to use for
     the fit in the analysis tool.
+
+    If ``logBufferSize`` is set in the config, motor frames are buffered in memory and written
+    to the log in batches of that many frames and when each test ends, and the test state is only
+    recorded when it changes. Each buffered frame keeps the timestamp at which it was taken.
+
+    If ``samplePeriod`` is set in the config, the `drive` and `log` callbacks are called from a
+    :class:`wpilib.Notifier` at that period instead of from the command scheduler, and the test
+    commands only start and stop the notifier. The callbacks must then be thread-safe. Motor
+    frames are always buffered in this mode.
+
+    :meth:`fullRoutine` runs all four tests in sequence, keeps the samples of one motor in memory,
+    and fits a feedforward model to them on the robot when the tests finish.
     """
 
+    MechanismType = MechanismType
+
     @dataclass
     class Config:
         """Hardware-independent configuration for a SysId test routine.
@@ -47,12 +72,20 @@ class SysIdRoutine(SysIdRoutineLog):
         :param recordState: Optional handle for recording test state in a third-party logging
                             solution. If provided, the test routine state will be passed to this callback instead of
                             logged in WPILog.
+        :param logBufferSize: Optional number of motor frames to buffer before writing them to
+                              the log. If provided, the `log` callback of the mechanism receives a
+                              buffer with the same `motor` interface as `SysIdRoutineLog`.
+        :param samplePeriod:  Optional period in seconds at which to drive and log the mechanism
+                              from a separate thread. If provided without `logBufferSize`, one second
+                              of frames is buffered.
         """
 
         rampRate: volts_per_second = 1.0
         stepVoltage: volts = 7.0
         timeout: seconds = 10.0
         recordState: Optional[Callable[[State], None]] = None
+        logBufferSize: Optional[int] = None
+        samplePeriod: Optional[seconds] = None
 
     @dataclass
     class Mechanism:
@@ -102,12 +135,130 @@ class SysIdRoutine(SysIdRoutineLog):
         self.outputVolts = 0.0
         self.logState = config.recordState or self.recordState
 
+        logBufferSize = config.logBufferSize
+        if logBufferSize is None and config.samplePeriod is not None:
+            logBufferSize = int(math.ceil(1.0 / config.samplePeriod))
+
+        self._logBuffer: Optional[SysIdLogBuffer] = None
+        if logBufferSize is not None:
+            self._logBuffer = SysIdLogBuffer(mechanism.name, logBufferSize)
+        self._lastState = State.kNone
+
+        # The samples of the motor analyzed by fullRoutine(), while it is running
+        self._samples: Optional[SysIdSampleTable] = None
+        self._sampleMotor: Optional[str] = None
+        self._gains: Optional[FeedforwardGains] = None
+        # The thread fitting the samples of the last fullRoutine(), if any
+        self._analysis: Optional[threading.Thread] = None
+
+        # The notifier is created the first time a test is run. The lock ensures that a
+        # sample in progress finishes before the test ends.
+        self._notifier: Optional[Notifier] = None
+        self._sampleLock = threading.Lock()
+        self._sampler: Optional[Callable[[], None]] = None
+
+    def _runSampler(self) -> None:
+        with self._sampleLock:
+            if self._sampler is not None:
+                self._sampler()
+
+    def _testCommand(
+        self,
+        state: State,
+        start: Callable[[], None],
+        sample: Callable[[], None],
+        end: Callable[[], None],
+    ) -> Command:
+        subsystem = self.mechanism.subsystem
+
+        if self.config.samplePeriod is None:
+            command = subsystem.runOnce(start).andThen(subsystem.run(sample))
+            return (
+                command.finallyDo(lambda interrupted: end())
+                .withName(f"sysid-{state}-{self.mechanism.name}")
+                .withTimeout(self.config.timeout)
+            )
+
+        period = self.config.samplePeriod
+
+        def startSampling():
+            if self._notifier is None:
+                self._notifier = Notifier(self._runSampler)
+                self._notifier.setName(f"sysid-{self.mechanism.name}")
+            start()
+            with self._sampleLock:
+                self._sampler = sample
+            self._notifier.startPeriodic(period)
+
+        def stopSampling(interrupted: bool):
+            if self._notifier is not None:
+                self._notifier.stop()
+            with self._sampleLock:
+                self._sampler = None
+                end()
+
+        return (
+            subsystem.runOnce(startSampling)
+            .andThen(subsystem.idle())
+            .finallyDo(stopSampling)
+            .withName(f"sysid-{state}-{self.mechanism.name}")
+            .withTimeout(self.config.timeout)
+        )
+
+    def _logFrame(self, state: State) -> None:
+        if self._logBuffer is None:
+            self.mechanism.log(self)
+            self.logState(state)
+            return
+
+        # Record the state first so that every frame of the test lies after it
+        if state != self._lastState:
+            self.logState(state)
+            self._lastState = state
+
+        timestamp = RobotController.getFPGATime()
+        self._logBuffer.beginFrame(timestamp)
+        self.mechanism.log(self._logBuffer)  # type: ignore[arg-type]
+
+        if self._samples is not None:
+            self._recordSample(state, timestamp)
+
+    def _recordSample(self, state: State, timestamp: int) -> None:
+        buffer = self._logBuffer
+        assert buffer is not None
+
+        motor = self._sampleMotor
+        if motor is None:
+            motorNames = buffer.motorNames()
+            if not motorNames:
+                return
+            motor = self._sampleMotor = motorNames[0]
+
+        voltage = buffer.current(motor, "voltage")
+        if math.isnan(voltage):
+            voltage = self.outputVolts
+
+        self._samples.append(  # type: ignore[union-attr]
+            state,
+            timestamp * 1e-6,
+            voltage,
+            buffer.current(motor, "position"),
+            buffer.current(motor, "velocity"),
+        )
+
+    def _endTest(self) -> None:
+        self.mechanism.drive(0.0)
+        if self._logBuffer is not None:
+            self._logBuffer.flush()
+        self.logState(State.kNone)
+        self._lastState = State.kNone
+
     def quasistatic(self, direction: Direction) -> Command:
         """Returns a command to run a quasistatic test in the specified direction.
 
         The command will call the `drive` and `log` callbacks supplied at routine construction once
-        per iteration. Upon command end or interruption, the `drive` callback is called with a value of
-        0 volts.
+        per iteration, or once per sample period if `samplePeriod` is configured. Upon command end or
+        interruption, the `drive` callback is called with a value of 0 volts.
 
         :param direction: The direction in which to run the test.
 
@@ -123,28 +274,20 @@ class SysIdRoutine(SysIdRoutineLog):
         def execute():
             self.outputVolts = direction.value * timer.get() * self.config.rampRate
             self.mechanism.drive(self.outputVolts)
-            self.mechanism.log(self)
-            self.logState(state)
+            self._logFrame(state)
 
-        def end(interrupted: bool):
-            self.mechanism.drive(0.0)
-            self.logState(State.kNone)
+        def end():
+            self._endTest()
             timer.stop()
 
-        return (
-            self.mechanism.subsystem.runOnce(timer.restart)
-            .andThen(self.mechanism.subsystem.run(execute))
-            .finallyDo(end)
-            .withName(f"sysid-{state}-{self.mechanism.name}")
-            .withTimeout(self.config.timeout)
-        )
+        return self._testCommand(state, timer.restart, execute, end)
 
     def dynamic(self, direction: Direction) -> Command:
         """Returns a command to run a dynamic test in the specified direction.
 
         The command will call the `drive` and `log` callbacks supplied at routine construction once
-        per iteration. Upon command end or interruption, the `drive` callback is called with a value of
-        0 volts.
+        per iteration, or once per sample period if `samplePeriod` is configured. Upon command end or
+        interruption, the `drive` callback is called with a value of 0 volts.
 
         :param direction: The direction in which to run the test.
 
@@ -161,17 +304,149 @@ class SysIdRoutine(SysIdRoutineLog):
 
         def execute():
             self.mechanism.drive(self.outputVolts)
-            self.mechanism.log(self)
-            self.logState(state)
+            self._logFrame(state)
+
+        return self._testCommand(state, command, execute, self._endTest)
+
+    def fullRoutine(
+        self,
+        restTime: seconds = 2.0,
+        mechanismType: _MechanismType = _MechanismType.kSimple,
+        motorName: Optional[str] = None,
+        forwardLimit: Optional[Callable[[], bool]] = None,
+        reverseLimit: Optional[Callable[[], bool]] = None,
+        quasistaticDuration: Optional[seconds] = None,
+        dynamicDuration: Optional[seconds] = None,
+    ) -> Command:
+        """Returns a command that runs the quasistatic and dynamic tests in both directions, and then
+        fits a feedforward model to the collected data.
+
+        Each test runs until the configured timeout, its duration if one is given, or the limit of
+        its direction, whichever comes first. Mechanisms with a limited range of motion, such as
+        elevators and arms, should be given limits or durations that stop them before their hard
+        stops.
+
+        While the command runs, the voltage, position and velocity of one motor are kept in
+        memory. When all of the tests have finished, the samples are fitted on a separate thread,
+        so the scheduler is not held up, and the status of the table under
+        ``/SysId/<mechanism name>`` is "analyzing". The fitted gains are then published to that
+        table and can be retrieved with :meth:`getFeedforwardGains`. No fit is made if the command
+        is interrupted. If the fit fails, the error is reported to the Driver Station and
+        published as the ``status`` of the table, and no gains are available.
+
+        If no ``logBufferSize`` is configured, motor frames are buffered while this command runs.
+
+        :param restTime:            The time to wait between tests, in seconds.
+        :param mechanismType:       The feedforward model to fit.
+        :param motorName:           The name of the motor to analyze. Defaults to the first motor
+                                    logged by the `log` callback.
+        :param forwardLimit:        Returns True when the mechanism must stop moving forward.
+        :param reverseLimit:        Returns True when the mechanism must stop moving in reverse.
+        :param quasistaticDuration: The duration of the quasistatic tests, in seconds.
+        :param dynamicDuration:     The duration of the dynamic tests, in seconds.
+
+        :returns: A command to run the tests and the analysis.
+        """
+        # Only buffer frames while this command runs, so the test commands keep logging as
+        # configured when they are run on their own
+        ownBuffer = self._logBuffer is None
+
+        def start():
+            if ownBuffer:
+                self._logBuffer = SysIdLogBuffer(self.mechanism.name, 256)
+            self._samples = SysIdSampleTable()
+            self._sampleMotor = motorName
 
         def end(interrupted: bool):
-            self.mechanism.drive(0.0)
-            self.logState(State.kNone)
+            if ownBuffer:
+                self._logBuffer = None
+            samples = self._samples
+            self._samples = None
+            if not interrupted and samples is not None:
+                self._startAnalysis(samples, mechanismType)
+
+        def limited(
+            command: Command,
+            duration: Optional[seconds],
+            limit: Optional[Callable[[], bool]],
+        ) -> Command:
+            if duration is not None:
+                command = command.withTimeout(duration)
+            if limit is not None:
+                command = command.until(limit)
+            return command
 
         return (
-            self.mechanism.subsystem.runOnce(command)
-            .andThen(self.mechanism.subsystem.run(execute))
+            self.mechanism.subsystem.runOnce(start)
+            .andThen(
+                limited(
+                    self.quasistatic(self.Direction.kForward),
+                    quasistaticDuration,
+                    forwardLimit,
+                ),
+                WaitCommand(restTime),
+                limited(
+                    self.quasistatic(self.Direction.kReverse),
+                    quasistaticDuration,
+                    reverseLimit,
+                ),
+                WaitCommand(restTime),
+                limited(
+                    self.dynamic(self.Direction.kForward),
+                    dynamicDuration,
+                    forwardLimit,
+                ),
+                WaitCommand(restTime),
+                limited(
+                    self.dynamic(self.Direction.kReverse),
+                    dynamicDuration,
+                    reverseLimit,
+                ),
+            )
             .finallyDo(end)
-            .withName(f"sysid-{state}-{self.mechanism.name}")
-            .withTimeout(self.config.timeout)
+            .withName(f"sysid-full-{self.mechanism.name}")
+        )
+
+    def _table(self) -> NetworkTable:
+        table = NetworkTableInstance.getDefault().getTable("SysId")
+        return table.getSubTable(self.mechanism.name)
+
+    def _startAnalysis(
+        self, samples: SysIdSampleTable, mechanismType: _MechanismType
+    ) -> None:
+        self._gains = None
+        self._table().putString("status", "analyzing")
+        self._analysis = threading.Thread(
+            target=self._analyze,
+            args=(samples, mechanismType),
+            name=f"sysid-analysis-{self.mechanism.name}",
+            daemon=True,
         )
+        self._analysis.start()
+
+    def _analyze(self, samples: SysIdSampleTable, mechanismType: _MechanismType):
+        table = self._table()
+        try:
+            gains = samples.fit(mechanismType)
+        except ValueError as e:
+            message = f"SysId analysis of {self.mechanism.name} failed: {e}"
+            reportError(message)
+            table.putString("status", message)
+            return
+
+        self._gains = gains
+        table.putString("status", "ok")
+        table.putNumber("kS", gains.kS)
+        table.putNumber("kV", gains.kV)
+        table.putNumber("kA", gains.kA)
+        table.putNumber("kG", gains.kG)
+        table.putNumber("rSquared", gains.rSquared)
+        table.putNumber("samples", gains.samples)
+
+    def getFeedforwardGains(self) -> Optional[FeedforwardGains]:
+        """Returns the gains fitted by the last completed :meth:`fullRoutine`, if any. The gains
+        are only available once the analysis thread has finished.
+
+        :returns: The fitted gains, or None.
+        """
+        return self._gains
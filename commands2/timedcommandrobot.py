@@ -11,6 +11,24 @@ class TimedCommandRobot(TimedRobot):
 
     def __init__(self, period: seconds = TimedRobot.kDefaultPeriod / 1000) -> None:
         super().__init__(period)
-        self.addPeriodic(
-            CommandScheduler.getInstance().run, period, self.kSchedulerOffset
-        )
+        scheduler = CommandScheduler.getInstance()
+        scheduler.setPeriod(period)
+        self.addPeriodic(scheduler.run, period, self.kSchedulerOffset)
+
+    def addScheduler(
+        self, name: str, period: seconds, offset: seconds = kSchedulerOffset
+    ) -> CommandScheduler:
+        """
+        Runs a named secondary scheduler at its own period, such as a fast scheduler for control
+        loops next to the main one. Register the subsystems that should run at this rate with the
+        returned scheduler.
+
+        :param name:   The name of the scheduler, see :meth:`.CommandScheduler.getNamedInstance`.
+        :param period: The period of the scheduler, in seconds.
+        :param offset: The offset from the common starting time, in seconds.
+        :returns: the named scheduler
+        """
+        scheduler = CommandScheduler.getNamedInstance(name)
+        scheduler.setPeriod(period)
+        self.addPeriodic(scheduler.run, period, offset)
+        return scheduler
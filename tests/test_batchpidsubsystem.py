@@ -0,0 +1,69 @@
+import commands2
+from wpimath.controller import PIDController
+
+import pytest
+
+
+class EvalSubsystem(commands2.BatchPIDSubsystem):
+    def __init__(self):
+        super().__init__(3, 1.5, 0.8, 0.1)
+        self.measurements = [0.0, 0.0, 0.0]
+        self.outputs = {}
+
+    def getMeasurements(self):
+        return self.measurements
+
+    def useOutput(self, index, output, setpoint):
+        self.outputs[index] = (output, setpoint)
+
+
+def test_batch_pid_matches_pidcontroller(scheduler: commands2.CommandScheduler):
+    subsystem = EvalSubsystem()
+    subsystem.setIntegratorRange(1, -0.5, 0.5)
+    subsystem.setIZone(2, 2.0)
+    subsystem.setSetpoints([1.0, 5.0, 3.0])
+    subsystem.enableAll()
+
+    controllers = [PIDController(1.5, 0.8, 0.1) for _ in range(3)]
+    controllers[1].setIntegratorRange(-0.5, 0.5)
+    controllers[2].setIZone(2.0)
+    for controller, setpoint in zip(controllers, [1.0, 5.0, 3.0]):
+        controller.setSetpoint(setpoint)
+        # Like PIDSubsystem.enable()
+        controller.reset()
+
+    for step in range(20):
+        subsystem.measurements = [0.05 * step, 0.2 * step, 0.15 * step]
+        scheduler.run()
+
+        for i, controller in enumerate(controllers):
+            expected = controller.calculate(subsystem.measurements[i])
+            assert subsystem.outputs[i][0] == pytest.approx(expected)
+            assert subsystem.outputs[i][1] == controller.getSetpoint()
+
+
+def test_batch_pid_enable_disable(scheduler: commands2.CommandScheduler):
+    subsystem = EvalSubsystem()
+    subsystem.setSetpoint(1, 2.0)
+
+    scheduler.run()
+    assert subsystem.outputs == {}
+
+    subsystem.enable(1)
+    scheduler.run()
+    assert list(subsystem.outputs) == [1]
+    assert subsystem.isEnabled(1)
+    assert not subsystem.isEnabled(0)
+
+    subsystem.disable(1)
+    assert subsystem.outputs[1] == (0, 0)
+    assert not subsystem.isEnabled(1)
+
+
+def test_batch_pid_checks_measurements(scheduler: commands2.CommandScheduler):
+    subsystem = EvalSubsystem()
+    subsystem.measurements = [0.0, 0.0]
+    subsystem.enable(0)
+
+    with pytest.raises(ValueError):
+        subsystem.periodic()
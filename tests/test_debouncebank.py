@@ -0,0 +1,55 @@
+from typing import TYPE_CHECKING
+
+import commands2
+import pytest
+from util import *  # type: ignore
+from wpimath.filter import Debouncer
+
+if TYPE_CHECKING:
+    from .util import *
+
+
+def test_debouncebank(scheduler: commands2.CommandScheduler):
+    command = commands2.Command()
+    start_spying_on(command)
+
+    with ManualSimTime() as sim:
+        bank = commands2.button.DebounceBank()
+        button = InternalButton()
+        debounced = bank.debounce(button, 0.1)
+        debounced.onTrue(command)
+
+        button.setPressed(True)
+        scheduler.run()
+        verify(command, never()).schedule()
+
+        sim.step(0.3)
+        scheduler.run()
+        verify(command).schedule()
+        assert bank.size() == 1
+
+
+@pytest.mark.parametrize(
+    "debounce_type",
+    [
+        Debouncer.DebounceType.kRising,
+        Debouncer.DebounceType.kFalling,
+        Debouncer.DebounceType.kBoth,
+    ],
+)
+def test_debouncebank_matches_debouncer(
+    scheduler: commands2.CommandScheduler, debounce_type: Debouncer.DebounceType
+):
+    pattern = [0, 1, 1, 0, 1, 1, 1, 1, 1, 0, 0, 1, 0, 0, 0, 0, 0, 1, 1, 1, 1, 0]
+
+    with ManualSimTime() as sim:
+        button = InternalButton()
+        bank = commands2.button.DebounceBank()
+        banked = bank.debounce(button, 0.07, debounce_type)
+        debouncer = Debouncer(0.07, debounce_type)
+
+        for pressed in pattern:
+            sim.step(0.02)
+            button.setPressed(bool(pressed))
+            scheduler.run()
+            assert banked.getAsBoolean() == debouncer.calculate(bool(pressed))
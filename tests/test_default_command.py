@@ -71,3 +71,42 @@ def test_defaultCommandDisableResume(scheduler: commands2.CommandScheduler):
     assert scheduler.isScheduled(defaultCommand)
 
     assert defaultCommand.end.called_with(True)
+
+
+def test_defaultCommandRescheduledAfterFinish(scheduler: commands2.CommandScheduler):
+    hasDefaultCommand = commands2.Subsystem()
+
+    counter = OOInteger()
+    defaultCommand = commands2.InstantCommand(
+        counter.incrementAndGet, hasDefaultCommand
+    )
+
+    scheduler.setDefaultCommand(hasDefaultCommand, defaultCommand)
+    scheduler.run()
+    assert counter == 1
+
+    # Finished and released during the run, scheduled again at its end
+    scheduler.run()
+    assert counter == 2
+    scheduler.run()
+    assert counter == 3
+
+
+def test_defaultCommandChangedWhileRunning(scheduler: commands2.CommandScheduler):
+    hasDefaultCommand = commands2.Subsystem()
+
+    defaultCommand = commands2.RunCommand(lambda: None, hasDefaultCommand)
+    otherDefault = commands2.RunCommand(lambda: None, hasDefaultCommand)
+
+    scheduler.setDefaultCommand(hasDefaultCommand, defaultCommand)
+    scheduler.run()
+    scheduler.setDefaultCommand(hasDefaultCommand, otherDefault)
+    scheduler.run()
+
+    # The running default command keeps running until the subsystem is released
+    assert scheduler.isScheduled(defaultCommand)
+    assert not scheduler.isScheduled(otherDefault)
+
+    scheduler.cancel(defaultCommand)
+    scheduler.run()
+    assert scheduler.isScheduled(otherDefault)
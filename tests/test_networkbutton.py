@@ -27,3 +27,123 @@ def test_networkbutton(
     scheduler.run()
     scheduler.run()
     verify(command).schedule()
+
+
+def test_event_networkbutton(
+    scheduler: commands2.CommandScheduler, nt_instance: NetworkTableInstance
+):
+    command = commands2.Command()
+    start_spying_on(command)
+
+    pub = nt_instance.getTable("TestTable").getBooleanTopic("Test").publish()
+    pub.set(False)
+
+    button = commands2.button.EventNetworkButton(nt_instance, "TestTable", "Test")
+    button.whileTrue(command)
+
+    scheduler.run()
+    assert not button.getAsBoolean()
+    assert command.schedule.times_called == 0
+
+    pub.set(True)
+    nt_instance.waitForListenerQueue(1.0)
+    scheduler.run()
+    assert button.getAsBoolean()
+    verify(command).schedule()
+
+    pub.set(False)
+    nt_instance.waitForListenerQueue(1.0)
+    scheduler.run()
+    assert not button.getAsBoolean()
+    verify(command).cancel()
+
+    button.close()
+
+
+def test_event_networkbutton_pulse(
+    scheduler: commands2.CommandScheduler, nt_instance: NetworkTableInstance
+):
+    command = commands2.Command()
+    start_spying_on(command)
+
+    pub = nt_instance.getTable("TestTable").getBooleanTopic("Test").publish()
+    pub.set(False)
+
+    button = commands2.button.EventNetworkButton(nt_instance, "TestTable", "Test")
+    button.onTrue(command)
+
+    # Pressed and released between two ticks
+    pub.set(True)
+    pub.set(False)
+    nt_instance.waitForListenerQueue(1.0)
+
+    scheduler.run()
+    verify(command).schedule()
+    assert button.getAsBoolean()
+
+    scheduler.run()
+    assert not button.getAsBoolean()
+    assert command.schedule.times_called == 1
+
+    button.close()
+
+
+def test_networkbuttonbank_array(
+    scheduler: commands2.CommandScheduler, nt_instance: NetworkTableInstance
+):
+    command1 = commands2.Command()
+    command2 = commands2.Command()
+    start_spying_on(command1)
+    start_spying_on(command2)
+
+    topic = nt_instance.getTable("TestTable").getBooleanArrayTopic("Buttons")
+    pub = topic.publish()
+    pub.set([False, False])
+
+    bank = commands2.button.NetworkButtonBank(topic)
+    assert bank.button(0) is bank.button(0)
+    bank.button(0).onTrue(command1)
+    bank.button(2).onTrue(command2)
+
+    scheduler.run()
+    assert command1.schedule.times_called == 0
+    assert command2.schedule.times_called == 0
+
+    pub.set([True, False, False])
+    scheduler.run()
+    verify(command1).schedule()
+    assert command2.schedule.times_called == 0
+
+    pub.set([False, False, True])
+    scheduler.run()
+    verify(command2).schedule()
+    assert bank.getBits() == 0b100
+
+
+def test_networkbuttonbank_bitmask(
+    scheduler: commands2.CommandScheduler, nt_instance: NetworkTableInstance
+):
+    topic = nt_instance.getTable("TestTable").getIntegerTopic("Buttons")
+    pub = topic.publish()
+    pub.set(0)
+
+    bank = commands2.button.NetworkButtonBank(topic.subscribe(0))
+    buttons = [bank.button(i) for i in range(4)]
+
+    pub.set(0b1010)
+    scheduler.run()
+    assert [button.getAsBoolean() for button in buttons] == [
+        False,
+        True,
+        False,
+        True,
+    ]
+
+    # The sign bit is button 63
+    high = bank.button(63)
+    pub.set(-(1 << 63) | 0b1)
+    scheduler.run()
+    assert high.getAsBoolean()
+    assert buttons[0].getAsBoolean()
+    assert not buttons[1].getAsBoolean()
+    assert bank.getBits() == (1 << 63) | 0b1
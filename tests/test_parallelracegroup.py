@@ -39,7 +39,8 @@ def test_parallelRaceSchedule(scheduler: commands2.CommandScheduler):
 
     verify(command1).execute()
     verify(command1).end(False)
-    verify(command2).execute()
+    # The race was decided by command1, command2 is not executed after it
+    verify(command2, never()).execute()
     verify(command2).end(True)
     verify(command2, never()).end(False)
 
@@ -160,7 +161,8 @@ def test_parallelRaceScheduleTwiceTest(scheduler: commands2.CommandScheduler):
 
     verify(command1).execute()
     verify(command1).end(False)
-    verify(command2).execute()
+    # The race was decided by command1, command2 is not executed after it
+    verify(command2, never()).execute()
     verify(command2).end(True)
     verify(command2, never()).end(False)
 
@@ -181,3 +183,24 @@ def test_parallelRaceScheduleTwiceTest(scheduler: commands2.CommandScheduler):
     scheduler.run()
 
     assert not scheduler.isScheduled(group)
+
+
+def test_parallelRaceCachesFinished(scheduler: commands2.CommandScheduler):
+    command1 = commands2.Command()
+    command2 = commands2.Command()
+
+    start_spying_on(command1)
+    start_spying_on(command2)
+
+    group = commands2.ParallelRaceGroup(command1, command2)
+    scheduler.schedule(group)
+
+    command2.isFinished = lambda: True
+    scheduler.run()
+
+    verify(command1).execute()
+    verify(command1).end(True)
+    verify(command2).execute()
+    verify(command2).end(False)
+    assert command1.isFinished.times_called == 1
+    assert not scheduler.isScheduled(group)
@@ -152,3 +152,22 @@ def test_parallelConditionalRunWhenDisabledTest(scheduler: commands2.CommandSche
     scheduler.schedule(parallel)
 
     assert not scheduler.isScheduled(runWhenDisabled)
+
+
+def test_runsWhenDisabledQueriedAtSchedule(scheduler: commands2.CommandScheduler):
+    command = commands2.Command()
+    start_spying_on(command)
+
+    scheduler.schedule(command)
+    for _ in range(3):
+        scheduler.run()
+    assert command.runsWhenDisabled.times_called == 1
+
+    DriverStationSim.setEnabled(False)
+    DriverStationSim.notifyNewData()
+    scheduler.run()
+    assert not scheduler.isScheduled(command)
+    assert command.runsWhenDisabled.times_called == 1
+
+    DriverStationSim.setEnabled(True)
+    DriverStationSim.notifyNewData()
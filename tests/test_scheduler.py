@@ -1,7 +1,9 @@
+import threading
 from typing import TYPE_CHECKING
 
 import commands2
 from util import *  # type: ignore
+from wpilib import LiveWindow, SendableBuilderImpl
 
 if TYPE_CHECKING:
     from .util import *
@@ -123,6 +125,20 @@ def test_schedulerCancelAll(scheduler: commands2.CommandScheduler):
     assert counter == 2
 
 
+def test_schedulerInterruptActionsOrder(scheduler: commands2.CommandScheduler):
+    calls = []
+
+    scheduler.onCommandInterruptWithCause(lambda command, _: calls.append("cause"))
+    scheduler.onCommandInterrupt(lambda command: calls.append("interrupt"))
+    scheduler.onCommandInterruptWithCause(lambda command, _: calls.append("cause2"))
+
+    command = commands2.WaitCommand(10)
+    scheduler.schedule(command)
+    scheduler.cancel(command)
+
+    assert calls == ["cause", "interrupt", "cause2"]
+
+
 def test_scheduleScheduledNoOp(scheduler: commands2.CommandScheduler):
     counter = OOInteger()
 
@@ -132,3 +148,443 @@ def test_scheduleScheduledNoOp(scheduler: commands2.CommandScheduler):
     scheduler.schedule(command)
 
     assert counter == 1
+
+
+def test_subsystem_periodic_rate(scheduler: commands2.CommandScheduler):
+    counters = [OOInteger() for _ in range(3)]
+    subsystems = []
+    for counter in counters:
+        subsystem = commands2.Subsystem()
+        subsystem.periodic = counter.incrementAndGet
+        subsystems.append(subsystem)
+
+    # 10 Hz on the default 50 Hz scheduler: every 5th tick
+    subsystems[0].setPeriodicRate(10)
+    subsystems[1].setPeriodicRate(10)
+    subsystems[2].setPeriodicRate(100)
+
+    assert scheduler.getRate(subsystems[0])[0] == 5
+    assert scheduler.getRate(subsystems[0]) != scheduler.getRate(subsystems[1])
+    assert scheduler.getRate(subsystems[2]) == (1, 0)
+
+    for _ in range(20):
+        scheduler.run()
+
+    assert counters[0] == 4
+    assert counters[1] == 4
+    assert counters[2] == 20
+
+
+def test_subsystem_periodic_rate_phase(scheduler: commands2.CommandScheduler):
+    tick = OOInteger()
+    runs = []
+    subsystem = commands2.Subsystem()
+    subsystem.periodic = lambda: runs.append(tick.get())
+    subsystem.setPeriodicRate(25, phase=1)
+
+    for _ in range(6):
+        scheduler.run()
+        tick.incrementAndGet()
+    assert runs == [1, 3, 5]
+
+    scheduler.clearRate(subsystem)
+    scheduler.run()
+    assert runs == [1, 3, 5, 6]
+
+
+def test_command_execute_rate(scheduler: commands2.CommandScheduler):
+    counter = OOInteger()
+    command = commands2.RunCommand(counter.incrementAndGet)
+    command.setExecuteRate(25)
+
+    scheduler.schedule(command)
+    for _ in range(10):
+        scheduler.run()
+    assert counter == 5
+
+
+def test_deferral_on_overrun(scheduler: commands2.CommandScheduler):
+    with ManualSimTime() as sim:
+        slow = commands2.Subsystem()
+        slow.periodic = lambda: sim.step(0.018)
+        slow.setPriority(1)
+
+        telemetryCounter = OOInteger()
+        telemetry = commands2.Subsystem()
+        telemetry.periodic = telemetryCounter.incrementAndGet
+        telemetry.setPriority(-1)
+
+        driveCounter = OOInteger()
+        drive = commands2.RunCommand(driveCounter.incrementAndGet)
+
+        scheduler.setDeferralThreshold(0.005)
+        scheduler.schedule(drive)
+
+        for _ in range(4):
+            scheduler.run()
+
+        # Deferred on overloaded ticks, but never twice in a row
+        assert telemetryCounter == 2
+        assert scheduler.getDeferralCount(telemetry) == 2
+        assert driveCounter == 4
+        assert scheduler.getDeferralCount(drive) == 0
+        assert scheduler.getDeferralCounts() == {telemetry: 2}
+
+
+def test_deferral_with_rate(scheduler: commands2.CommandScheduler):
+    with ManualSimTime() as sim:
+        slow = commands2.Subsystem()
+        slow.periodic = lambda: sim.step(0.025)
+        slow.setPriority(1)
+
+        counter = OOInteger()
+        telemetry = commands2.Subsystem()
+        telemetry.periodic = counter.incrementAndGet
+        scheduler.setRate(telemetry, 10)
+
+        scheduler.setDeferralThreshold(0.005, 1)
+        for _ in range(50):
+            scheduler.run()
+
+        # Deferred on each of its ticks, and run on the tick right after instead
+        assert counter == 10
+        assert scheduler.getDeferralCount(telemetry) == 10
+
+
+def test_no_deferral_within_budget(scheduler: commands2.CommandScheduler):
+    with ManualSimTime():
+        counter = OOInteger()
+        telemetry = commands2.Subsystem()
+        telemetry.periodic = counter.incrementAndGet
+        telemetry.setPriority(-1)
+
+        scheduler.setDeferralThreshold(0.005)
+        for _ in range(3):
+            scheduler.run()
+
+        assert counter == 3
+        assert scheduler.getDeferralCounts() == {}
+
+
+def test_named_scheduler(scheduler: commands2.CommandScheduler):
+    control = commands2.CommandScheduler.getNamedInstance("control")
+    assert control is commands2.CommandScheduler.getNamedInstance("control")
+    assert control is not scheduler
+
+    mainCounter = OOInteger()
+    mainSubsystem = commands2.Subsystem()
+    mainSubsystem.periodic = mainCounter.incrementAndGet
+
+    controlCounter = OOInteger()
+    controlSubsystem = commands2.Subsystem()
+    controlSubsystem.periodic = controlCounter.incrementAndGet
+    control.registerSubsystem(controlSubsystem)
+
+    executeCounter = OOInteger()
+    command = commands2.RunCommand(executeCounter.incrementAndGet, controlSubsystem)
+    # Routed to the scheduler that owns the requirements
+    command.schedule()
+    assert command.isScheduled()
+    assert controlSubsystem.getCurrentCommand() is command
+    assert scheduler.requiring(controlSubsystem) is command
+
+    scheduler.run()
+    assert mainCounter == 1
+    assert controlCounter == 0
+    assert executeCounter == 0
+
+    for _ in range(4):
+        control.run()
+    assert mainCounter == 1
+    assert controlCounter == 4
+    assert executeCounter == 4
+
+    command.cancel()
+    assert not command.isScheduled()
+
+
+def test_named_scheduler_cancel_all(scheduler: commands2.CommandScheduler):
+    control = commands2.CommandScheduler.getNamedInstance("control")
+    subsystem = commands2.Subsystem()
+    control.registerSubsystem(subsystem)
+
+    command = commands2.RunCommand(lambda: None, subsystem)
+    command.schedule()
+    assert command.isScheduled()
+
+    scheduler.cancelAll()
+    assert not command.isScheduled()
+
+
+def test_named_scheduler_livewindow(monkeypatch: pytest.MonkeyPatch):
+    callbacks = {}
+    monkeypatch.setattr(
+        LiveWindow, "setEnabledCallback", lambda f: callbacks.__setitem__("enabled", f)
+    )
+    monkeypatch.setattr(
+        LiveWindow,
+        "setDisabledCallback",
+        lambda f: callbacks.__setitem__("disabled", f),
+    )
+    commands2.CommandScheduler.resetInstance()
+    scheduler = commands2.CommandScheduler.getInstance()
+
+    control = commands2.CommandScheduler.getNamedInstance("control")
+    subsystem = commands2.Subsystem()
+    control.registerSubsystem(subsystem)
+
+    counter = OOInteger()
+    command = commands2.RunCommand(counter.incrementAndGet, subsystem)
+    command.schedule()
+
+    callbacks["enabled"]()
+    assert not command.isScheduled()
+    command.schedule()
+    assert not command.isScheduled()
+
+    callbacks["disabled"]()
+    command.schedule()
+    control.run()
+    assert counter == 1
+    scheduler.cancelAll()
+
+
+def test_named_scheduler_default_command(scheduler: commands2.CommandScheduler):
+    control = commands2.CommandScheduler.getNamedInstance("control")
+    subsystem = commands2.Subsystem()
+    control.registerSubsystem(subsystem)
+
+    defaultCommand = commands2.RunCommand(lambda: None, subsystem)
+    subsystem.setDefaultCommand(defaultCommand)
+    assert subsystem.getDefaultCommand() is defaultCommand
+
+    scheduler.run()
+    assert not defaultCommand.isScheduled()
+    control.run()
+    assert defaultCommand.isScheduled()
+
+
+def test_named_scheduler_conflicts(scheduler: commands2.CommandScheduler):
+    control = commands2.CommandScheduler.getNamedInstance("control")
+    telemetry = commands2.CommandScheduler.getNamedInstance("telemetry")
+
+    controlSubsystem = commands2.Subsystem()
+    control.registerSubsystem(controlSubsystem)
+    with pytest.raises(commands2.IllegalCommandUse):
+        telemetry.registerSubsystem(controlSubsystem)
+    with pytest.raises(commands2.IllegalCommandUse):
+        scheduler.registerSubsystem(controlSubsystem)
+
+    mainSubsystem = commands2.Subsystem()
+    mainSubsystem.setDefaultCommand(commands2.RunCommand(lambda: None, mainSubsystem))
+    with pytest.raises(commands2.IllegalCommandUse):
+        control.registerSubsystem(mainSubsystem)
+
+    # Reported and dropped rather than raised, since it may happen in a binding
+    command = commands2.RunCommand(lambda: None, controlSubsystem, mainSubsystem)
+    command.schedule()
+    assert not command.isScheduled()
+    command.cancel()
+
+    button = InternalButton()
+    button.whileTrue(command)
+    button.setPressed(True)
+    scheduler.run()
+    assert not command.isScheduled()
+
+    with pytest.raises(commands2.IllegalCommandUse):
+        scheduler.setRate(command, 10)
+
+
+def test_only_overridden_periodics_called(
+    scheduler: commands2.CommandScheduler, monkeypatch: pytest.MonkeyPatch
+):
+    baseCounter = OOInteger()
+    monkeypatch.setattr(
+        commands2.Subsystem, "periodic", lambda self: baseCounter.incrementAndGet()
+    )
+
+    periodicCounter = OOInteger()
+    simulationCounter = OOInteger()
+
+    class SimulatedSubsystem(commands2.Subsystem):
+        def simulationPeriodic(self):
+            simulationCounter.incrementAndGet()
+
+    plain = commands2.Subsystem()
+    simulated = SimulatedSubsystem()
+    patched = commands2.Subsystem()
+    patched.periodic = periodicCounter.incrementAndGet
+
+    scheduler.run()
+    scheduler.run()
+
+    assert baseCounter == 0
+    assert periodicCounter == 2
+    assert simulationCounter == 2
+
+    # Registration changes are picked up on the next run
+    scheduler.unregisterSubsystem(patched)
+    scheduler.run()
+    assert periodicCounter == 2
+
+
+def test_filtered_command_actions(scheduler: commands2.CommandScheduler):
+    subsystem = commands2.Subsystem()
+
+    driveCommand = commands2.RunCommand(lambda: None, subsystem).withName("DriveArcade")
+    ledCommand = commands2.WaitUntilCommand(lambda: False).withName("Leds")
+    printCommand = commands2.PrintCommand("hi")
+
+    everything = []
+    bySubsystem = []
+    byName = []
+    byType = []
+    byCommand = []
+    scheduler.onCommandExecute(everything.append)
+    scheduler.onCommandExecute(bySubsystem.append, subsystem=subsystem)
+    scheduler.onCommandExecute(byName.append, name="^Drive")
+    scheduler.onCommandExecute(byType.append, commandType=commands2.PrintCommand)
+    scheduler.onCommandExecute(byCommand.append, command=ledCommand)
+
+    scheduler.schedule(driveCommand, ledCommand, printCommand)
+    scheduler.run()
+
+    assert everything == [driveCommand, ledCommand, printCommand]
+    assert bySubsystem == [driveCommand]
+    assert byName == [driveCommand]
+    assert byType == [printCommand]
+    assert byCommand == [ledCommand]
+
+
+def test_filtered_interrupt_actions(scheduler: commands2.CommandScheduler):
+    subsystem = commands2.Subsystem()
+    command = commands2.RunCommand(lambda: None, subsystem)
+    interruptor = commands2.RunCommand(lambda: None, subsystem)
+    other = commands2.RunCommand(lambda: None)
+
+    interrupted = []
+    causes = []
+    scheduler.onCommandInterrupt(interrupted.append, subsystem=subsystem)
+    scheduler.onCommandInterruptWithCause(
+        lambda cmd, cause: causes.append((cmd, cause)), command=command
+    )
+
+    scheduler.schedule(command, other)
+    scheduler.schedule(interruptor)
+    scheduler.cancel(other)
+
+    assert interrupted == [command]
+    assert causes == [(command, interruptor)]
+
+
+def test_actions_added_while_scheduled(scheduler: commands2.CommandScheduler):
+    command = commands2.RunCommand(lambda: None)
+    scheduler.schedule(command)
+
+    executed = []
+    scheduler.onCommandExecute(executed.append, command=command)
+    scheduler.run()
+    assert executed == [command]
+
+
+def test_commands_executed_batch(scheduler: commands2.CommandScheduler):
+    command1 = commands2.RunCommand(lambda: None)
+    command2 = commands2.InstantCommand()
+
+    batches = []
+    scheduler.onCommandsExecuted(lambda commands: batches.append(list(commands)))
+
+    scheduler.schedule(command1, command2)
+    scheduler.run()
+    scheduler.run()
+
+    assert batches == [[command1, command2], [command1]]
+
+
+def test_sendableCachesScheduledCommands(
+    scheduler: commands2.CommandScheduler, nt_instance
+):
+    names = OOInteger()
+
+    class NamedCommand(commands2.Command):
+        def getName(self) -> str:
+            names.incrementAndGet()
+            return "Named"
+
+    builder = SendableBuilderImpl()
+    builder.setTable(nt_instance.getTable("Scheduler"))
+    scheduler.initSendable(builder)
+    builder.startListeners()
+    table = nt_instance.getTable("Scheduler")
+
+    command = NamedCommand()
+    scheduler.schedule(command)
+    names.set(0)
+    builder.update()
+    builder.update()
+
+    assert table.getEntry("Names").getStringArray([]) == ["Named"]
+    assert table.getEntry("Ids").getIntegerArray([]) == [id(command)]
+    assert names == 1
+
+    table.getEntry("Cancel").setIntegerArray([id(command)])
+    builder.update()
+
+    assert not scheduler.isScheduled(command)
+    names.set(0)
+    builder.update()
+    assert table.getEntry("Names").getStringArray([]) == []
+    assert names == 0
+
+
+def test_scheduleFromThread(scheduler: commands2.CommandScheduler):
+    commands = [commands2.RunCommand(lambda: None) for _ in range(40)]
+
+    def submit(chunk):
+        for command in chunk:
+            scheduler.scheduleFromThread(command)
+
+    threads = [
+        threading.Thread(target=submit, args=(commands[i::4],)) for i in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert scheduler.getSubmissionQueueDepth() == 40
+    assert not scheduler.isScheduled(*commands)
+
+    scheduler.run()
+
+    assert scheduler.getSubmissionQueueDepth() == 0
+    assert scheduler.isScheduled(*commands)
+
+    scheduler.cancelFromThread(*commands[:10])
+    scheduler.run()
+
+    assert not any(scheduler.isScheduled(command) for command in commands[:10])
+    assert scheduler.isScheduled(*commands[10:])
+
+
+def test_submissionLatency(scheduler: commands2.CommandScheduler):
+    command = commands2.RunCommand(lambda: None)
+
+    with ManualSimTime() as sim:
+        scheduler.scheduleFromThread(command)
+        sim.step(0.05)
+        scheduler.cancelFromThread(command)
+        sim.step(0.01)
+        scheduler.run()
+
+        assert scheduler.getSubmissionLatency() == pytest.approx(0.06)
+        assert not scheduler.isScheduled(command)
+
+        scheduler.scheduleFromThread(command)
+        sim.step(0.02)
+        scheduler.run()
+
+        assert scheduler.getSubmissionLatency() == pytest.approx(0.02)
+        assert scheduler.getMaxSubmissionLatency() == pytest.approx(0.06)
+        assert scheduler.isScheduled(command)
@@ -0,0 +1,158 @@
+import json
+import os
+import time
+from typing import TYPE_CHECKING
+
+import commands2
+import pytest
+from commands2 import chrometrace
+from commands2.schedulertrace import readTrace
+from util import *  # type: ignore
+from wpilib import DataLogManager
+
+if TYPE_CHECKING:
+    from .util import *
+
+
+@pytest.fixture
+def datalog(tmp_path):
+    DataLogManager.start(str(tmp_path))
+    yield tmp_path
+    DataLogManager.stop()
+
+
+def read_log(path, expected_events: int):
+    # The log is written by a background thread
+    (filename,) = os.listdir(path)
+    names, events = {}, []
+    for _ in range(50):
+        try:
+            names, events = readTrace(os.path.join(path, filename))
+        except ValueError:
+            pass  # The header has not been written yet
+        if len(events) >= expected_events:
+            break
+        time.sleep(0.05)
+    return names, events
+
+
+def test_trace_buffers_events(scheduler: commands2.CommandScheduler, datalog):
+    trace = commands2.SchedulerTrace(capacity=16, flushPeriod=1000)
+    scheduler.setTrace(trace)
+    assert scheduler.getTrace() is trace
+
+    command = commands2.InstantCommand()
+    scheduler.schedule(command)
+    scheduler.run()
+
+    # schedule, initialize and finish
+    assert trace.size() == 3
+    scheduler.setTrace(None)
+    assert trace.size() == 0
+
+
+def test_trace_profile_slices(scheduler: commands2.CommandScheduler, datalog):
+    trace = commands2.SchedulerTrace(capacity=16, flushPeriod=1000, profile=True)
+    scheduler.setTrace(trace)
+
+    command = commands2.InstantCommand()
+    scheduler.schedule(command)
+    scheduler.run()
+
+    # schedule, initialize, then the tick, poll and execute slices and the finish
+    assert trace.size() == 9
+    scheduler.setTrace(None)
+
+
+def test_trace_events(scheduler: commands2.CommandScheduler, datalog):
+    trace = commands2.SchedulerTrace(capacity=4, flushPeriod=1000)
+    scheduler.setTrace(trace)
+
+    subsystem = commands2.Subsystem()
+    subsystem.setName("Drive")
+    command1 = commands2.RunCommand(lambda: None, subsystem).withName("First")
+    command2 = commands2.InstantCommand(lambda: None, subsystem).withName("Second")
+
+    scheduler.schedule(command1)
+    scheduler.schedule(command2)
+    scheduler.run()
+    trace.flush()
+    DataLogManager.getLog().flush()
+
+    names, events = read_log(datalog, 7)
+    E = commands2.TraceEvent
+    lifecycle = [event for event in events if event[1] <= E.kRequirement]
+
+    assert sorted(names.values()) == [
+        ("command", "First"),
+        ("command", "Second"),
+        ("subsystem", "Drive"),
+    ]
+    ids = {name: traceId for traceId, (_, name) in names.items()}
+    first, second, drive = ids["First"], ids["Second"], ids["Drive"]
+
+    assert [event[1:] for event in lifecycle] == [
+        (E.kSchedule, first, -1),
+        (E.kInitialize, first, -1),
+        (E.kSchedule, second, -1),
+        (E.kInterrupt, first, second),
+        (E.kRequirement, second, drive),
+        (E.kInitialize, second, -1),
+        (E.kFinish, second, -1),
+    ]
+
+
+def test_chrome_trace(scheduler: commands2.CommandScheduler, datalog):
+    trace = commands2.SchedulerTrace(flushPeriod=1000, profile=True)
+    scheduler.setTrace(trace)
+
+    class Drive(commands2.Subsystem):
+        def periodic(self):
+            pass
+
+    drive = Drive()
+    drive.setName("Drive")
+
+    group = commands2.ParallelCommandGroup(
+        commands2.RunCommand(lambda: None).withName("A"),
+        commands2.RunCommand(lambda: None).withName("B"),
+    )
+    group.setName("Group")
+    scheduler.schedule(group)
+    scheduler.run()
+    scheduler.setTrace(None)
+    DataLogManager.getLog().flush()
+
+    names, events = read_log(datalog, 14)
+    (filename,) = os.listdir(datalog)
+    output = datalog / "trace.json"
+    assert chrometrace.main([str(datalog / filename), "-o", str(output)]) == 0
+
+    with open(output) as f:
+        document = json.load(f)
+    assert document == chrometrace.toChromeTrace(names, events)
+
+    slices = [
+        (event["ph"], event["name"], event.get("args"))
+        for event in document["traceEvents"]
+        if event["ph"] != "i"
+    ]
+    assert slices == [
+        ("B", "CommandScheduler.run()", None),
+        ("B", "Drive.periodic()", None),
+        ("E", "Drive.periodic()", None),
+        ("B", "buttons.run()", None),
+        ("E", "buttons.run()", None),
+        ("B", "Group.execute()", None),
+        ("B", "A.execute()", {"parent": "Group"}),
+        ("E", "A.execute()", {"parent": "Group"}),
+        ("B", "B.execute()", {"parent": "Group"}),
+        ("E", "B.execute()", {"parent": "Group"}),
+        ("E", "Group.execute()", None),
+        ("E", "CommandScheduler.run()", None),
+    ]
+
+    instants = [
+        event["name"] for event in document["traceEvents"] if event["ph"] == "i"
+    ]
+    assert instants == ["Group.schedule", "Group.initialize"]
@@ -92,3 +92,181 @@ def test_selectCommandRequirement(scheduler: commands2.CommandScheduler):
     verify(command1).end(interrupted=True)
     verify(command2, never()).end(interrupted=True)
     verify(command3, never()).end(interrupted=True)
+
+
+def test_selectCommandSelectedRequirements(scheduler: commands2.CommandScheduler):
+    system1 = commands2.Subsystem()
+    system2 = commands2.Subsystem()
+    system3 = commands2.Subsystem()
+
+    command1 = commands2.Command()
+    command1.addRequirements(system1)
+    command2 = commands2.Command()
+    command2.addRequirements(system2)
+
+    defaultCommand = commands2.RunCommand(lambda: None, system2)
+    scheduler.setDefaultCommand(system2, defaultCommand)
+    scheduler.run()
+    assert scheduler.isScheduled(defaultCommand)
+
+    selectCommand = commands2.SelectCommand(
+        {"one": command1, "two": command2}, lambda: "one", selectedRequirements=True
+    )
+
+    scheduler.schedule(selectCommand)
+
+    assert scheduler.isScheduled(selectCommand)
+    assert scheduler.isScheduled(defaultCommand)
+    assert scheduler.requiring(system1) is selectCommand
+    assert scheduler.requiring(system2) is defaultCommand
+    assert scheduler.requiring(system3) is None
+
+    scheduler.cancel(selectCommand)
+
+    assert scheduler.requiring(system1) is None
+    assert scheduler.requiring(system2) is defaultCommand
+
+
+def test_selectCommandSelectedRequirementsLatched(
+    scheduler: commands2.CommandScheduler,
+):
+    system1 = commands2.Subsystem()
+    system2 = commands2.Subsystem()
+
+    command1 = commands2.Command()
+    command1.addRequirements(system1)
+    command2 = commands2.Command()
+    command2.addRequirements(system2)
+
+    start_spying_on(command1)
+    start_spying_on(command2)
+
+    selection = ["one"]
+    selectCommand = commands2.SelectCommand(
+        {"one": command1, "two": command2},
+        lambda: selection[0],
+        selectedRequirements=True,
+    )
+
+    scheduler.schedule(selectCommand)
+    selection[0] = "two"
+    scheduler.run()
+
+    verify(command1).initialize()
+    verify(command1).execute()
+    verify(command2, never()).initialize()
+    assert scheduler.requiring(system1) is selectCommand
+    assert scheduler.requiring(system2) is None
+
+    command1.isFinished = lambda: True
+    scheduler.run()
+
+    assert not scheduler.isScheduled(selectCommand)
+    assert scheduler.requiring(system1) is None
+
+
+def test_selectCommandSelectedRequirementsComposed(
+    scheduler: commands2.CommandScheduler,
+):
+    system1 = commands2.Subsystem()
+    system2 = commands2.Subsystem()
+
+    command1 = commands2.Command()
+    command1.addRequirements(system1)
+    command2 = commands2.Command()
+    command2.addRequirements(system2)
+
+    selectCommand = commands2.SelectCommand(
+        {"one": command1, "two": command2}, lambda: "one", selectedRequirements=True
+    )
+    group = commands2.SequentialCommandGroup(selectCommand)
+
+    assert group.getRequirements() == {system1, system2}
+
+
+def test_selectCommandSelectedRequirementsQueries(
+    scheduler: commands2.CommandScheduler,
+):
+    system1 = commands2.Subsystem()
+
+    command1 = commands2.Command()
+    command1.addRequirements(system1)
+
+    calls = OOInteger()
+
+    def selector():
+        calls.incrementAndGet()
+        return "one"
+
+    selectCommand = commands2.SelectCommand(
+        {"one": command1}, selector, selectedRequirements=True
+    )
+
+    selectCommand.getRequirements()
+    selectCommand.hasRequirement(system1)
+    scheduler.isScheduled(selectCommand)
+    assert calls == 0
+
+    scheduler.schedule(selectCommand)
+    assert calls == 1
+    assert scheduler.requiring(system1) is selectCommand
+
+    selectCommand.getRequirements()
+    scheduler.run()
+    assert calls == 1
+
+
+def test_selectCommandSelectedRequirementsDefaultCommand(
+    scheduler: commands2.CommandScheduler,
+):
+    system1 = commands2.Subsystem()
+    system2 = commands2.Subsystem()
+
+    command1 = commands2.RunCommand(lambda: None, system1)
+    command2 = commands2.RunCommand(lambda: None, system2)
+
+    selectCommand = commands2.SelectCommand(
+        {"one": command1, "two": command2}, lambda: "one", selectedRequirements=True
+    )
+
+    # Not scheduled: requires the subsystems of all of its options
+    assert selectCommand.getRequirements() == {system1, system2}
+    assert selectCommand.hasRequirement(system2)
+
+    scheduler.setDefaultCommand(system1, selectCommand)
+    scheduler.run()
+
+    assert scheduler.isScheduled(selectCommand)
+    assert scheduler.requiring(system1) is selectCommand
+    assert scheduler.requiring(system2) is None
+
+
+def test_selectCommandSelectedRequirementsRejected(
+    scheduler: commands2.CommandScheduler,
+):
+    system1 = commands2.Subsystem()
+    system2 = commands2.Subsystem()
+
+    holder = commands2.RunCommand(lambda: None, system1).withInterruptBehavior(
+        commands2.InterruptionBehavior.kCancelIncoming
+    )
+    scheduler.schedule(holder)
+
+    command1 = commands2.Command()
+    command1.addRequirements(system1)
+    command2 = commands2.Command()
+    command2.addRequirements(system2)
+
+    selectCommand = commands2.SelectCommand(
+        {"one": command1, "two": command2}, lambda: "one", selectedRequirements=True
+    )
+
+    scheduler.schedule(selectCommand)
+
+    assert not scheduler.isScheduled(selectCommand)
+    assert scheduler.requiring(system1) is holder
+    # The rejected selection does not linger
+    assert selectCommand.getRequirements() == {system1, system2}
+    assert selectCommand.getInterruptionBehavior() == (
+        commands2.InterruptionBehavior.kCancelSelf
+    )
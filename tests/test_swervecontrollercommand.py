@@ -37,7 +37,8 @@ import pytest
 import commands2
 
 
-def test_swervecontrollercommand():
+@pytest.mark.parametrize("sample_period", [None, 0.005])
+def test_swervecontrollercommand(sample_period):
     timer = Timer()
     angle = Rotation2d(0)
 
@@ -112,6 +113,7 @@ def test_swervecontrollercommand():
             ),
             outputModuleStates=set_module_states,
             requirements=(subsystem,),
+            samplePeriod=sample_period,
         )
 
         timer.restart()
@@ -140,3 +142,138 @@ def test_swervecontrollercommand():
             get_robot_pose().rotation().radians(),
             angular_tolerance,
         )
+
+
+def test_swervecontrollercommand_samples_match_trajectory():
+    waypoints = [Pose2d(0, 0, Rotation2d(0)), Pose2d(1, 5, Rotation2d(3))]
+    trajectory = TrajectoryGenerator.generateTrajectory(
+        waypoints, TrajectoryConfig(8.8, 0.1)
+    )
+
+    command = commands2.SwerveControllerCommand(
+        trajectory=trajectory,
+        pose=Pose2d,
+        kinematics=SwerveDrive4Kinematics(
+            Translation2d(0.25, 0.25),
+            Translation2d(0.25, -0.25),
+            Translation2d(-0.25, 0.25),
+            Translation2d(-0.25, -0.25),
+        ),
+        controller=HolonomicDriveController(
+            PIDController(0.6, 0, 0),
+            PIDController(0.6, 0, 0),
+            ProfiledPIDControllerRadians(
+                1, 0, 0, TrapezoidProfileRadians.Constraints(3 * math.pi, math.pi)
+            ),
+        ),
+        outputModuleStates=lambda states: None,
+        requirements=(),
+        samplePeriod=0.02,
+    )
+
+    samples = command._samples
+    assert samples is not None
+    assert len(samples) == math.ceil(trajectory.totalTime() / 0.02) + 1
+    for i, state in enumerate(samples):
+        expected = trajectory.sample(i * 0.02)
+        assert state.t == pytest.approx(expected.t)
+        assert state.pose == expected.pose
+
+
+def test_swervecontrollercommand_evaluate():
+    waypoints = [Pose2d(0, 0, Rotation2d(0)), Pose2d(1, 5, Rotation2d(3))]
+    trajectory = TrajectoryGenerator.generateTrajectory(
+        waypoints, TrajectoryConfig(8.8, 0.1)
+    )
+    kinematics = SwerveDrive4Kinematics(
+        Translation2d(0.25, 0.25),
+        Translation2d(0.25, -0.25),
+        Translation2d(-0.25, 0.25),
+        Translation2d(-0.25, -0.25),
+    )
+
+    def make_controller():
+        return HolonomicDriveController(
+            PIDController(0.6, 0, 0),
+            PIDController(0.6, 0, 0),
+            ProfiledPIDControllerRadians(
+                1, 0, 0, TrapezoidProfileRadians.Constraints(3 * math.pi, math.pi)
+            ),
+        )
+
+    command = commands2.SwerveControllerCommand(
+        trajectory=trajectory,
+        pose=Pose2d,
+        kinematics=kinematics,
+        controller=make_controller(),
+        outputModuleStates=lambda states: None,
+        requirements=(),
+    )
+
+    timestamps = [10.0 + 0.02 * i for i in range(50)]
+    xs = [0.01 * i for i in range(50)]
+    ys = [0.05 * i for i in range(50)]
+    headings = [0.02 * i for i in range(50)]
+
+    speeds, module_states = command.evaluate(timestamps, xs, ys, headings)
+
+    assert len(speeds) == 50
+    assert len(module_states) == 50
+
+    controller = make_controller()
+    end_rotation = trajectory.states()[-1].pose.rotation()
+    for i in range(50):
+        expected = controller.calculate(
+            Pose2d(xs[i], ys[i], headings[i]),
+            trajectory.sample(timestamps[i] - timestamps[0]),
+            end_rotation,
+        )
+        assert speeds[i].vx == pytest.approx(expected.vx)
+        assert speeds[i].vy == pytest.approx(expected.vy)
+        assert speeds[i].omega == pytest.approx(expected.omega)
+        assert len(module_states[i]) == 4
+
+
+def test_swervecontrollercommand_evaluate_repeatable(
+    scheduler: commands2.CommandScheduler,
+):
+    waypoints = [Pose2d(0, 0, Rotation2d(0)), Pose2d(1, 5, Rotation2d(3))]
+    trajectory = TrajectoryGenerator.generateTrajectory(
+        waypoints, TrajectoryConfig(8.8, 0.1)
+    )
+    subsystem = commands2.Subsystem()
+
+    command = commands2.SwerveControllerCommand(
+        trajectory=trajectory,
+        pose=Pose2d,
+        kinematics=SwerveDrive4Kinematics(
+            Translation2d(0.25, 0.25),
+            Translation2d(0.25, -0.25),
+            Translation2d(-0.25, 0.25),
+            Translation2d(-0.25, -0.25),
+        ),
+        controller=HolonomicDriveController(
+            PIDController(0.6, 0, 0.1),
+            PIDController(0.6, 0, 0.1),
+            ProfiledPIDControllerRadians(
+                1, 0, 0, TrapezoidProfileRadians.Constraints(3 * math.pi, math.pi)
+            ),
+        ),
+        outputModuleStates=lambda states: None,
+        requirements=(subsystem,),
+    )
+
+    timestamps = [0.02 * i for i in range(20)]
+    xs = [0.02 * i for i in range(20)]
+    ys = [0.1 * i for i in range(20)]
+    headings = [0.5 + 0.05 * i for i in range(20)]
+
+    first, _ = command.evaluate(timestamps, xs, ys, headings)
+    second, _ = command.evaluate(timestamps, xs, ys, headings)
+
+    for a, b in zip(first, second):
+        assert (a.vx, a.vy, a.omega) == (b.vx, b.vy, b.omega)
+
+    scheduler.schedule(command)
+    with pytest.raises(commands2.IllegalCommandUse):
+        command.evaluate(timestamps, xs, ys, headings)
@@ -1,9 +1,14 @@
+import math
+
 import pytest
 from unittest.mock import Mock, call, ANY
 from wpilib.simulation import stepTiming, pauseTiming, resumeTiming
 from wpimath.units import volts
 from commands2 import Command, Subsystem
 from commands2.sysid import SysIdRoutine
+from commands2.sysid.sysidanalysis import SysIdSampleTable
+from ntcore import NetworkTableInstance
+from wpilib import DataLogManager
 from wpilib.sysid import SysIdRoutineLog, State
 
 
@@ -51,6 +56,13 @@ def dynamic_reverse(sysid_routine):
     return sysid_routine.dynamic(SysIdRoutine.Direction.kReverse)
 
 
+@pytest.fixture
+def datalog(tmp_path):
+    DataLogManager.start(str(tmp_path))
+    yield
+    DataLogManager.stop()
+
+
 @pytest.fixture(autouse=True)
 def timing():
     pauseTiming()
@@ -166,3 +178,227 @@ def test_tests_output_correct_voltage(
         ],
         any_order=False,
     )
+
+
+def test_buffered_logging(mechanism, datalog):
+    positions = iter(range(100))
+
+    def log(log: SysIdRoutineLog):
+        mechanism.log(log)
+        log.motor("motor").voltage(3.0).position(next(positions))
+
+    routine = SysIdRoutine(
+        SysIdRoutine.Config(recordState=mechanism.recordState, logBufferSize=2),
+        SysIdRoutine.Mechanism(mechanism.drive, log, Subsystem()),
+    )
+    buffer = routine._logBuffer
+
+    command = routine.quasistatic(SysIdRoutine.Direction.kForward)
+    command.initialize()
+    command.execute()
+    for _ in range(4):
+        stepTiming(0.02)
+        command.execute()
+
+    # The first execute only starts the timer, and the first two frames were
+    # written to the log when the buffer filled up
+    assert buffer.size() == 2
+    assert list(buffer.column("motor", "position")) == [2.0, 3.0]
+    assert list(buffer.column("motor", "voltage")) == [3.0, 3.0]
+
+    command.end(True)
+
+    assert buffer.size() == 0
+    assert mechanism.recordState.call_args_list == [
+        call(State.kQuasistaticForward),
+        call(State.kNone),
+    ]
+
+
+def test_high_rate_sampling(mechanism, datalog):
+    frames = []
+
+    def log(log: SysIdRoutineLog):
+        frames.append(log)
+        log.motor("motor").voltage(7.0)
+
+    routine = SysIdRoutine(
+        SysIdRoutine.Config(recordState=mechanism.recordState, samplePeriod=0.005),
+        SysIdRoutine.Mechanism(mechanism.drive, log, Subsystem()),
+    )
+
+    command = routine.dynamic(SysIdRoutine.Direction.kForward)
+    command.initialize()
+    command.execute()
+    mechanism.drive.assert_not_called()
+
+    stepTiming(0.1)
+    command.execute()
+    command.end(True)
+
+    assert len(frames) >= 10
+    mechanism.drive.assert_has_calls([call(pytest.approx(7.0))] * 10)
+    assert mechanism.drive.call_args == call(pytest.approx(0.0))
+    assert mechanism.recordState.call_args_list == [
+        call(State.kDynamicForward),
+        call(State.kNone),
+    ]
+
+    count = len(frames)
+    stepTiming(0.1)
+    assert len(frames) == count
+
+
+def test_full_routine_fits_feedforward(scheduler, datalog):
+    kS, kV, kA = 0.5, 2.0, 0.4
+    dt = 0.005
+    plant = {"volts": 0.0, "position": 0.0, "velocity": 0.0}
+
+    def drive(volts: float):
+        plant["volts"] = volts
+
+    def log(log: SysIdRoutineLog):
+        log.motor("motor").voltage(plant["volts"]).position(plant["position"]).velocity(
+            plant["velocity"]
+        )
+
+    def step_plant():
+        volts, velocity = plant["volts"], plant["velocity"]
+        if velocity == 0 and abs(volts) <= kS:
+            return
+        direction = math.copysign(1.0, velocity if velocity != 0 else volts)
+        acceleration = (volts - kS * direction - kV * velocity) / kA
+        new_velocity = velocity + acceleration * dt
+        if new_velocity * velocity < 0 and abs(volts) <= kS:
+            new_velocity = 0.0
+        plant["velocity"] = new_velocity
+        plant["position"] += new_velocity * dt
+
+    routine = SysIdRoutine(
+        SysIdRoutine.Config(rampRate=1.0, stepVoltage=4.0, timeout=3.0),
+        SysIdRoutine.Mechanism(drive, log, Subsystem(), "plant"),
+    )
+
+    command = routine.fullRoutine(restTime=1.0)
+    scheduler.schedule(command)
+    while command.isScheduled():
+        scheduler.run()
+        step_plant()
+        stepTiming(dt)
+
+    # The fit runs on a separate thread
+    assert routine._analysis is not None
+    routine._analysis.join()
+    gains = routine.getFeedforwardGains()
+    assert gains is not None
+    assert gains.kS == pytest.approx(kS, rel=0.1)
+    assert gains.kV == pytest.approx(kV, rel=0.1)
+    assert gains.kA == pytest.approx(kA, rel=0.1)
+    assert gains.kG == 0.0
+    assert gains.rSquared > 0.95
+
+
+def test_full_routine_reports_failed_fit(scheduler, datalog, monkeypatch):
+    errors = []
+    monkeypatch.setattr(
+        "commands2.sysid.sysidroutine.reportError", lambda error: errors.append(error)
+    )
+
+    routine = SysIdRoutine(
+        SysIdRoutine.Config(timeout=0.5),
+        SysIdRoutine.Mechanism(
+            lambda volts: None, lambda log: None, Subsystem(), "idle"
+        ),
+    )
+
+    command = routine.fullRoutine(restTime=0.1)
+    scheduler.schedule(command)
+    while command.isScheduled():
+        scheduler.run()
+        stepTiming(0.02)
+
+    assert routine._analysis is not None
+    routine._analysis.join()
+    assert routine.getFeedforwardGains() is None
+    assert len(errors) == 1
+
+    table = NetworkTableInstance.getDefault().getTable("SysId").getSubTable("idle")
+    assert table.getString("status", "") == errors[0]
+
+
+def test_full_routine_limits(scheduler, datalog):
+    plant = {"volts": 0.0, "position": 0.0}
+    voltages = []
+
+    def drive(volts: float):
+        plant["volts"] = volts
+        voltages.append(volts)
+
+    routine = SysIdRoutine(
+        SysIdRoutine.Config(timeout=10.0),
+        SysIdRoutine.Mechanism(drive, lambda log: None, Subsystem(), "limited"),
+    )
+
+    command = routine.fullRoutine(
+        restTime=0.1,
+        forwardLimit=lambda: plant["position"] >= 1.0,
+        reverseLimit=lambda: plant["position"] <= -1.0,
+        dynamicDuration=0.5,
+    )
+    scheduler.schedule(command)
+    ticks = 0
+    while command.isScheduled():
+        scheduler.run()
+        plant["position"] += plant["volts"] * 0.02
+        stepTiming(0.02)
+        ticks += 1
+        assert ticks < 1000
+
+    assert routine._analysis is not None
+    routine._analysis.join()
+    assert max(voltages) > 0
+    assert min(voltages) < 0
+
+
+def test_full_routine_buffers_only_while_running(scheduler, datalog):
+    routine = SysIdRoutine(
+        SysIdRoutine.Config(timeout=0.5),
+        SysIdRoutine.Mechanism(lambda volts: None, lambda log: None, Subsystem()),
+    )
+    quasistatic = routine.quasistatic(SysIdRoutine.Direction.kForward)
+    command = routine.fullRoutine(restTime=0.1)
+    assert routine._logBuffer is None
+
+    scheduler.schedule(command)
+    scheduler.run()
+    assert routine._logBuffer is not None
+
+    scheduler.cancel(command)
+    assert routine._logBuffer is None
+
+    scheduler.schedule(quasistatic)
+    scheduler.run()
+    assert routine._logBuffer is None
+
+
+def test_sample_table_fits_elevator():
+    kG, kS, kV, kA = 0.7, 0.3, 1.5, 0.2
+    table = SysIdSampleTable()
+    for state, direction, start in (
+        (State.kDynamicForward, 1, 0.0),
+        (State.kDynamicReverse, -1, 2.0),
+    ):
+        for i in range(50):
+            t = i * 0.02
+            velocity = direction * (1 + 0.5 * t + 0.2 * t * t)
+            acceleration = direction * (0.5 + 0.4 * t)
+            volts = kG + kS * direction + kV * velocity + kA * acceleration
+            table.append(state, start + t, volts, 0.0, velocity)
+
+    gains = table.fit(SysIdRoutine.MechanismType.kElevator)
+
+    assert gains.samples == 96
+    assert gains.kG == pytest.approx(kG)
+    assert gains.kS == pytest.approx(kS)
+    assert gains.kV == pytest.approx(kV)
+    assert gains.kA == pytest.approx(kA)
@@ -234,3 +234,48 @@ def test_booleanSupplier():
     assert button() == False
     button.setPressed(True)
     assert button() == True
+
+
+def test_sampled_ticks(scheduler: commands2.CommandScheduler):
+    counter = OOInteger(0)
+    button = InternalButton()
+
+    def condition():
+        counter.incrementAndGet()
+        return button.getAsBoolean()
+
+    sampled = commands2.button.Trigger(condition).sampled(ticks=3)
+    # Consumers of the same poll all see one value
+    composed = sampled & sampled
+    assert counter == 1
+
+    button.setPressed(True)
+    scheduler.run()
+    scheduler.run()
+    assert not sampled.getAsBoolean()
+    assert not composed.getAsBoolean()
+    assert counter == 1
+
+    scheduler.run()
+    assert sampled.getAsBoolean()
+    assert composed.getAsBoolean()
+    assert counter == 2
+
+
+def test_sampled_seconds(scheduler: commands2.CommandScheduler):
+    command = commands2.Command()
+    start_spying_on(command)
+
+    with ManualSimTime() as sim:
+        button = InternalButton()
+        sampled = button.sampled(0.1)
+        sampled.onTrue(command)
+
+        button.setPressed(True)
+        sim.step(0.02)
+        scheduler.run()
+        verify(command, never()).schedule()
+
+        sim.step(0.1)
+        scheduler.run()
+        verify(command).schedule()
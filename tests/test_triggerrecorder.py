@@ -0,0 +1,93 @@
+from typing import TYPE_CHECKING
+
+import commands2
+import pytest
+from commands2.button import TriggerRecorder, TriggerReplayer
+from util import *  # type: ignore
+from wpilib import RobotState, Timer
+from wpilib.simulation import DriverStationSim
+
+if TYPE_CHECKING:
+    from .util import *
+
+
+def test_record_replay(scheduler: commands2.CommandScheduler, tmp_path):
+    filename = str(tmp_path / "match.rec")
+    pattern = [False, True, True, False, True, False, False, True]
+
+    with ManualSimTime() as sim:
+        button = InternalButton()
+        recorded = OOInteger()
+        button.onTrue(commands2.InstantCommand(recorded.incrementAndGet))
+
+        recorder = TriggerRecorder({"button": button})
+        start = Timer.getFPGATimestamp()
+        for i, pressed in enumerate(pattern):
+            button.setPressed(pressed)
+            if i == 5:
+                DriverStationSim.setAutonomous(True)
+                DriverStationSim.notifyNewData()
+            scheduler.run()
+            sim.step(0.02 if i % 2 else 0.03)
+        recorder.save(filename)
+        recorder.close()
+        recordedTime = Timer.getFPGATimestamp() - start
+
+        assert recorder.size() == len(pattern)
+        assert recorded == 3
+
+        DriverStationSim.setAutonomous(False)
+        DriverStationSim.notifyNewData()
+
+        replayButton = InternalButton()
+        replayed = OOInteger()
+        replayButton.onTrue(commands2.InstantCommand(replayed.incrementAndGet))
+
+        replayer = TriggerReplayer(filename, {"button": replayButton})
+        assert replayer.size() == len(pattern)
+
+        start = Timer.getFPGATimestamp()
+        assert replayer.run(scheduler) == len(pattern)
+        replayer.close()
+
+        assert replayed == 3
+        assert RobotState.isAutonomous()
+        # The last recorded period is after the last sample
+        assert Timer.getFPGATimestamp() - start == pytest.approx(
+            recordedTime - 0.02, abs=1e-6
+        )
+        assert not replayer.step()
+
+    DriverStationSim.setAutonomous(False)
+    DriverStationSim.notifyNewData()
+
+
+def test_replay_missing_trigger(scheduler: commands2.CommandScheduler, tmp_path):
+    filename = str(tmp_path / "match.rec")
+    recorder = TriggerRecorder({"a": InternalButton()})
+    scheduler.run()
+    recorder.save(filename)
+
+    with pytest.raises(ValueError):
+        TriggerReplayer(filename, {"b": InternalButton()})
+
+
+def test_record_at_poll_time(scheduler: commands2.CommandScheduler):
+    button = InternalButton()
+    seen = []
+    button.onTrue(commands2.InstantCommand(lambda: seen.append(True)))
+    recorder = TriggerRecorder({"button": button})
+
+    # Pressed between polls, seen by the bindings and recorded on the next poll
+    button.setPressed(True)
+    scheduler.run()
+    assert seen == [True]
+    assert recorder._columns[-1] == bytearray([1])
+
+    button.setPressed(False)
+    scheduler.run()
+    assert recorder._columns[-1] == bytearray([1, 0])
+
+    recorder.close()
+    scheduler.run()
+    assert recorder.size() == 2